@@ -0,0 +1,174 @@
+"""
+胡润榜单处理流程基准测试
+
+用本地回放服务器代替 hurun.net，分别测量 爬取/解析/DataFrame构造/汇总统计/绘图
+各阶段在不同数据规模下的耗时、吞吐量和峰值内存
+
+用法:
+    python bench_hurun.py                       # 使用合成数据，规模 1k/10k/100k
+    python bench_hurun.py --sizes 1000 5000     # 指定规模
+    python bench_hurun.py --fixtures pages/     # 回放录制的 HsRankDetailsList 响应
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import hurun_fetch
+from hurun_fetch import fetch_rank_pages
+from hurun_parse import ColumnBuffers, parse_page
+from hurun_render import PREVIEW, render_figure
+from hurun_summary import summarize
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# 合成数据的取值范围
+INDUSTRIES = ['房地产', '医药', '投资', '半导体', '化工', '钢铁', '金融服务', '电子商务', '汽车制造', '食品饮料']
+PLACES = ['中国-浙江-杭州', '中国-广东-深圳', '中国-江苏-苏州', '中国-福建-泉州', '中国-香港', '中国-台湾-台北',
+          '中国-上海', '中国-四川-成都', '美国']
+
+
+def synthetic_rows(n, seed=0):
+    """生成 n 条与接口格式一致的合成记录"""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append({
+            'hs_Rank_Rich_Ranking': i + 1,
+            'hs_Rank_Rich_ChaName_Cn': f'富豪{i}',
+            'hs_Rank_Rich_Wealth': round(rnd.lognormvariate(5, 0.8)),
+            'hs_Rank_Rich_ComName_Cn': f'公司{i % 5000}',
+            'hs_Rank_Rich_Industry_Cn': rnd.choice(INDUSTRIES),
+            'hs_Character': [{
+                'hs_Character_Gender': '女士' if rnd.random() < 0.08 else '先生',
+                'hs_Character_Age': rnd.randint(28, 95),
+                'hs_Character_BirthPlace_Cn': rnd.choice(PLACES)
+            }]
+        })
+    return rows
+
+
+def load_fixture_rows(fixture_dir):
+    """读取录制的响应文件（每个文件为一页 JSON），按文件名顺序拼接 rows"""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            rows.extend(json.load(f).get('rows', []))
+    return rows
+
+
+def scale_rows(rows, n):
+    """将录制数据循环复制到 n 条，并重新编排排名"""
+    scaled = []
+    for i in range(n):
+        row = dict(rows[i % len(rows)])
+        row['hs_Rank_Rich_Ranking'] = i + 1
+        scaled.append(row)
+    return scaled
+
+
+def start_fixture_server(rows):
+    """启动本地回放服务器，按 offset/limit 返回对应的 rows"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            offset = int(query['offset'][0])
+            limit = int(query['limit'][0])
+            body = json.dumps({'rows': rows[offset:offset + limit]}, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(func, *args):
+    """
+    执行一个阶段并测量耗时与峰值内存
+
+    tracemalloc 会显著拖慢内存分配，因此先单独计时，再在跟踪下重跑一次测峰值内存
+
+    返回:
+        tuple: (返回值, 耗时秒, 峰值内存MB)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def run_size(rows, page_limit, max_workers, out_dir):
+    """对一组数据依次运行各阶段，返回 [(阶段, 耗时, 峰值内存)]"""
+    server = start_fixture_server(rows)
+    hurun_fetch.RANK_URL = (f'http://127.0.0.1:{server.server_port}/HsRankDetailsList'
+                            '?num={}&search=&offset={}&limit={}')
+    results = []
+    try:
+        # 回放服务器不需要限速，max_rps 传 None
+        pages, t, mem = measure(fetch_rank_pages, 'BENCH', len(rows), page_limit, max_workers, None)
+        results.append(('爬取', t, mem))
+    finally:
+        server.shutdown()
+
+    def parse_all():
+        buffers = ColumnBuffers(len(rows))
+        for page in pages:
+            parse_page(page.body, buffers, page.offset)
+        return buffers
+
+    buffers, t, mem = measure(parse_all)
+    results.append(('解析', t, mem))
+    df, t, mem = measure(buffers.to_frame)
+    results.append(('DataFrame构造', t, mem))
+    summary, t, mem = measure(summarize, df)
+    results.append(('汇总统计', t, mem))
+    _, t, mem = measure(lambda: [render_figure(name, summary, PREVIEW, out_dir)
+                                 for name in ('行业分析', '多维度分析')])
+    results.append(('绘图', t, mem))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='胡润榜单处理流程基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='测试的数据规模（行数）')
+    parser.add_argument('--fixtures', help='录制的响应文件目录，不指定则使用合成数据')
+    parser.add_argument('--page-limit', type=int, default=1000, help='每页条数')
+    parser.add_argument('--workers', type=int, default=8, help='并发请求数')
+    args = parser.parse_args()
+
+    base_rows = load_fixture_rows(args.fixtures) if args.fixtures else None
+    fetch_args = dict(page_limit=args.page_limit, max_workers=args.workers)
+
+    print(f"{'规模':>8} {'阶段':<12} {'耗时(s)':>10} {'吞吐(行/s)':>14} {'峰值内存(MB)':>14}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for n in args.sizes:
+            rows = scale_rows(base_rows, n) if base_rows else synthetic_rows(n)
+            for stage, t, mem in run_size(rows, out_dir=out_dir, **fetch_args):
+                print(f"{n:>8} {stage:<12} {t:>10.3f} {n / t:>14,.0f} {mem:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+
+class PageCache:
+    """
+    榜单页面的磁盘缓存，按 URL 存放原始响应体及其校验信息
+
+    每个 URL 对应两个文件:
+        <key>.meta.json: ETag、Last-Modified、内容哈希和爬取时间
+        <key>.body.gz: gzip 压缩后的原始响应体
+
+    参数:
+        cache_dir (str): 缓存目录
+    """
+
+    def __init__(self, cache_dir='.hurun_cache'):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def get(self, url):
+        """读取缓存元数据，不存在时返回 None"""
+        try:
+            with open(self._path(url, '.meta.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def body(self, url):
+        """读取缓存的原始响应体"""
+        with gzip.open(self._path(url, '.body.gz'), 'rb') as f:
+            return f.read()
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """
+        写入一次成功的响应
+
+        返回:
+            bool: 内容与缓存相比是否发生变化
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        entry = self.get(url)
+        changed = entry is None or entry.get('hash') != digest
+
+        # 内容未变化时只刷新元数据，不重写响应体；先写临时文件再替换，中断时不会留下不完整的响应体
+        if changed:
+            path = self._path(url, '.body.gz')
+            tmp_path = path + '.tmp'
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        self._write_meta(url, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'hash': digest,
+            'fetched_at': time.time()
+        })
+        return changed
+
+    def touch(self, url):
+        """服务器返回 304 时刷新爬取时间"""
+        entry = self.get(url)
+        entry['fetched_at'] = time.time()
+        self._write_meta(url, entry)
+
+    def _write_meta(self, url, entry):
+        path = self._path(url, '.meta.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def conditional_headers(entry):
+        """根据缓存元数据构造条件请求头"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def is_fresh(entry, max_age):
+        """判断缓存是否在 max_age 秒内爬取过"""
+        return entry is not None and time.time() - entry.get('fetched_at', 0) < max_age
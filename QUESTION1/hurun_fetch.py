@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from hurun_cache import PageCache
+
+# 胡润榜单接口
+RANK_URL = 'https://www.hurun.net/zh-CN/Rank/HsRankDetailsList?num={}&search=&offset={}&limit={}'
+
+# 构造请求头
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Linux;Android 6.0;Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/99.0.4844.51 Safari/537.36',
+    'Accept': 'application/json,text/javascript,*/*;q=0.01',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate,br',
+    'Content-Type': 'application/json',
+    'referer': 'https://www.hurun.net/zh-CN/Rank/HsRankDetails?pagetype=rich'
+}
+
+# 单页爬取结果: offset、原始响应体、内容相对缓存是否变化
+Page = namedtuple('Page', ['offset', 'body', 'changed'])
+
+
+class RateLimiter:
+    """
+    线程安全的限速器，保证相邻两次请求的发出间隔不小于 1/max_rps 秒
+
+    参数:
+        max_rps (float): 每秒最多发出的请求数，None 或 0 表示不限速
+    """
+
+    def __init__(self, max_rps):
+        self.interval = 1.0 / max_rps if max_rps else 0.0
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """阻塞直到允许发出下一个请求"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def make_session(pool_size):
+    """创建带连接池的会话，所有页面请求复用同一组连接"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def fetch_page(session, limiter, num, offset, limit, timeout=15, cache=None, max_age=None):
+    """
+    爬取单页榜单数据
+
+    参数:
+        cache (PageCache): 页面缓存，None 表示不使用缓存
+        max_age (float): 仅刷新过期页面模式，缓存在 max_age 秒内的页面直接复用，不发请求
+
+    返回:
+        Page: 该页的原始响应体及内容是否变化
+    """
+    url = RANK_URL.format(num, offset, limit)
+    entry = cache.get(url) if cache else None
+
+    if max_age is not None and cache and cache.is_fresh(entry, max_age):
+        print('offset={} 缓存未过期，跳过'.format(offset))
+        return Page(offset, cache.body(url), False)
+
+    limiter.acquire()
+    print('爬取offset={}'.format(offset))
+    res = session.get(url, headers=PageCache.conditional_headers(entry), timeout=timeout)
+
+    # 服务器确认内容未变化
+    if res.status_code == 304 and entry is not None:
+        cache.touch(url)
+        return Page(offset, cache.body(url), False)
+
+    res.raise_for_status()
+    body = res.content
+    if cache is None:
+        return Page(offset, body, True)
+
+    changed = cache.put(url, body, res.headers.get('ETag'), res.headers.get('Last-Modified'))
+    return Page(offset, body, changed)
+
+
+def fetch_rank_pages(num='ODBYW2BI', total=1000, limit=100, max_workers=4, max_rps=2.0, timeout=15,
+                     cache=None, max_age=None):
+    """
+    并发爬取整张榜单，并按 offset 顺序返回各页
+
+    参数:
+        num (str): 榜单编号
+        total (int): 需要爬取的总条数
+        limit (int): 每页条数
+        max_workers (int): 同时在途的最大请求数
+        max_rps (float): 每秒最多发出的请求数
+        timeout (float): 单次请求超时时间（秒）
+        cache (PageCache): 页面缓存，None 表示不使用缓存
+        max_age (float): 仅刷新过期页面模式的缓存有效期（秒），None 表示每页都发条件请求
+
+    返回:
+        list: 按 offset 排列的 Page 列表
+    """
+    offsets = range(0, total, limit)
+    limiter = RateLimiter(max_rps)
+
+    with make_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {offset: pool.submit(fetch_page, session, limiter, num, offset, limit, timeout, cache, max_age)
+                   for offset in offsets}
+
+        # 按 offset 顺序收集，保证拼接结果与串行爬取一致
+        return [futures[offset].result() for offset in offsets]
@@ -0,0 +1,156 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from hurun_store import load_table, save_table
+
+# 变化类型
+NEW = '新上榜'
+DROP = '落榜'
+MOVE = '变动'
+
+CHANGE_COLUMNS = ['年份', '键', '姓名', '公司名称', '类型',
+                  '上年排名', '排名', '排名变化', '上年财富', '财富', '财富变化']
+
+
+def record_keys(df):
+    """以 姓名+公司名称 作为跨年度识别同一富豪的键"""
+    return df['姓名'].astype(str) + '|' + df['公司名称'].astype(str)
+
+
+def diff_lists(year, prev, curr):
+    """
+    计算相邻两年榜单之间的变化，只返回有变化的记录
+
+    参数:
+        year (int): 当前年份
+        prev (DataFrame): 上一年榜单
+        curr (DataFrame): 当前年份榜单
+
+    返回:
+        DataFrame: 新上榜、落榜以及排名或财富发生变化的记录
+    """
+    cols = ['姓名', '公司名称', '排名', '财富']
+    prev = prev[cols].set_index(record_keys(prev))
+    curr = curr[cols].set_index(record_keys(curr))
+    prev = prev[~prev.index.duplicated()]
+    curr = curr[~curr.index.duplicated()]
+
+    merged = prev.join(curr, how='outer', lsuffix='_prev')
+    in_prev = merged['姓名_prev'].notna()
+    in_curr = merged['姓名'].notna()
+
+    rank_prev = merged['排名_prev'].astype('float64')
+    rank = merged['排名'].astype('float64')
+    changes = pd.DataFrame({
+        '年份': year,
+        '键': merged.index,
+        '姓名': merged['姓名'].where(in_curr, merged['姓名_prev']),
+        '公司名称': merged['公司名称'].where(in_curr, merged['公司名称_prev']),
+        '类型': np.select([~in_prev, ~in_curr], [NEW, DROP], MOVE),
+        '上年排名': rank_prev,
+        '排名': rank,
+        # 排名数字变小代表上升，记为正数
+        '排名变化': rank_prev - rank,
+        '上年财富': merged['财富_prev'],
+        '财富': merged['财富'],
+        '财富变化': merged['财富'] - merged['财富_prev']
+    }, columns=CHANGE_COLUMNS).reset_index(drop=True)
+
+    moved = (changes['排名变化'].fillna(0) != 0) | (changes['财富变化'].fillna(0) != 0)
+    return changes[(changes['类型'] != MOVE) | moved]
+
+
+class HistoryStore:
+    """
+    多年度胡润榜单历史库
+
+    每年的榜单以 Feather 快照保存，入库时即与上一年比较并把变化写入变化日志，
+    查询某年的增减只需读取该年的变化记录，不再对两年全表做连接
+
+    目录结构:
+        <root>/<年份>.feather: 各年榜单快照
+        <root>/changes.feather: 按年份排序的变化日志
+
+    参数:
+        root (str): 历史库目录
+    """
+
+    def __init__(self, root='hurun_history'):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._changes_file = os.path.join(root, 'changes.feather')
+        if os.path.exists(self._changes_file):
+            self._set_changes(pd.read_feather(self._changes_file))
+        else:
+            self._set_changes(pd.DataFrame(columns=CHANGE_COLUMNS))
+
+    @property
+    def years(self):
+        """已入库的年份，升序"""
+        return sorted(int(f[:-len('.feather')]) for f in os.listdir(self.root)
+                      if f[:-len('.feather')].isdigit())
+
+    def snapshot(self, year):
+        """读取某一年的榜单快照"""
+        return load_table(os.path.join(self.root, f'{year}.feather'))
+
+    def ingest(self, year, df):
+        """
+        写入一年的榜单，并更新该年及下一年的变化记录
+
+        参数:
+            year (int): 榜单年份
+            df (DataFrame): 该年榜单
+        """
+        save_table(df, os.path.join(self.root, f'{year}.feather'))
+        years = self.years
+        pos = years.index(year)
+
+        updated = {}
+        if pos > 0:
+            updated[year] = diff_lists(year, self.snapshot(years[pos - 1]), df)
+        # 插入中间年份时，下一年的变化基准也随之改变
+        if pos + 1 < len(years):
+            next_year = years[pos + 1]
+            updated[next_year] = diff_lists(next_year, df, self.snapshot(next_year))
+
+        kept = self.changes[~self.changes['年份'].isin(updated)]
+        self._set_changes(pd.concat([kept] + list(updated.values()), ignore_index=True))
+        self.changes.to_feather(self._changes_file)
+
+    def _set_changes(self, changes):
+        """按年份排序变化日志，并建立 年份 -> 行区间 的索引"""
+        changes = changes.astype({'年份': 'int64'}).sort_values(['年份', '排名'], kind='stable')
+        self.changes = changes.reset_index(drop=True)
+        years = self.changes['年份'].to_numpy()
+        uniques = np.unique(years)
+        starts = np.searchsorted(years, uniques, side='left')
+        ends = np.searchsorted(years, uniques, side='right')
+        self._year_index = {int(y): (s, e) for y, s, e in zip(uniques, starts, ends)}
+
+    def deltas(self, year):
+        """某年相对上一年的全部变化记录"""
+        start, end = self._year_index.get(year, (0, 0))
+        return self.changes.iloc[start:end]
+
+    def new_entrants(self, year):
+        """某年新上榜的富豪"""
+        d = self.deltas(year)
+        return d[d['类型'] == NEW]
+
+    def dropouts(self, year):
+        """某年落榜的富豪"""
+        d = self.deltas(year)
+        return d[d['类型'] == DROP]
+
+    def movers(self, year, by='排名变化', top=10):
+        """某年排名或财富变化最大的富豪，by 为 '排名变化' 或 '财富变化'"""
+        d = self.deltas(year)
+        return d[d['类型'] == MOVE].sort_values(by, ascending=False).head(top)
+
+    def history_of(self, name, company):
+        """某位富豪历年的变化记录"""
+        key = f'{name}|{company}'
+        return self.changes[self.changes['键'] == key]
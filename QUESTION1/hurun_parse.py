@@ -0,0 +1,139 @@
+import io
+import json
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from hurun_store import normalize_types
+
+try:
+    import ijson
+except ImportError:  # 未安装 ijson 时整页解码
+    ijson = None
+
+# 解析失败的行: 所在页 offset、页内序号、原因
+ParseError = namedtuple('ParseError', ['offset', 'index', 'reason'])
+
+# 列名 -> (字段所在位置, 字段名)
+FIELDS = {
+    '排名': ('row', 'hs_Rank_Rich_Ranking'),
+    '姓名': ('row', 'hs_Rank_Rich_ChaName_Cn'),
+    '性别': ('character', 'hs_Character_Gender'),
+    '年龄': ('character', 'hs_Character_Age'),
+    '出生地': ('character', 'hs_Character_BirthPlace_Cn'),
+    '财富': ('row', 'hs_Rank_Rich_Wealth'),
+    '公司名称': ('row', 'hs_Rank_Rich_ComName_Cn'),
+    '行业名称': ('row', 'hs_Rank_Rich_Industry_Cn')
+}
+NUMERIC_FIELDS = {'排名', '年龄', '财富'}
+
+
+class ColumnBuffers:
+    """
+    预分配的按列缓冲区，数值列为 float64 数组，文本列为 object 数组
+
+    容量不足时按倍数扩容，避免逐行 append 到 Python 列表
+
+    参数:
+        capacity (int): 初始容量（行数）
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.columns = {col: self._empty(col, max(capacity, 1)) for col in FIELDS}
+
+    @staticmethod
+    def _empty(col, n):
+        if col in NUMERIC_FIELDS:
+            return np.full(n, np.nan)
+        return np.full(n, None, dtype=object)
+
+    def _grow(self):
+        capacity = len(self.columns['排名']) * 2
+        for col, arr in self.columns.items():
+            bigger = self._empty(col, capacity)
+            bigger[:self.size] = arr[:self.size]
+            self.columns[col] = bigger
+
+    def append(self, row, character):
+        """写入一行，character 为 None 时人物字段留空"""
+        if self.size == len(self.columns['排名']):
+            self._grow()
+        i = self.size
+        for col, (source, key) in FIELDS.items():
+            record = row if source == 'row' else character
+            if record is None:
+                continue
+            value = record.get(key)
+            if value is None or value == '':
+                continue
+            if col in NUMERIC_FIELDS:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+            self.columns[col][i] = value
+        self.size += 1
+
+    def to_frame(self):
+        """转换为带类型的 DataFrame"""
+        return normalize_types(pd.DataFrame({col: arr[:self.size] for col, arr in self.columns.items()}))
+
+
+def iter_rows(body):
+    """逐行解码单页响应体中的 rows，安装了 ijson 时不构造整页对象"""
+    if ijson is None:
+        yield from json.loads(body).get('rows', [])
+    else:
+        yield from ijson.items(io.BytesIO(body), 'rows.item', use_float=True)
+
+
+def parse_page(body, buffers, offset=0, errors=None):
+    """
+    将单页响应体流式写入列缓冲区
+
+    缺少 hs_Character 的行仍写入榜单字段，人物字段留空，并记录到 errors
+
+    参数:
+        body (bytes): 原始响应体
+        buffers (ColumnBuffers): 目标缓冲区
+        offset (int): 该页 offset，用于错误报告
+        errors (list): 收集 ParseError 的列表
+
+    返回:
+        int: 写入的行数
+    """
+    errors = [] if errors is None else errors
+    count = 0
+    for index, row in enumerate(iter_rows(body)):
+        if not isinstance(row, dict):
+            errors.append(ParseError(offset, index, '行不是JSON对象'))
+            continue
+        characters = row.get('hs_Character')
+        character = None
+        if isinstance(characters, list) and characters and isinstance(characters[0], dict):
+            character = characters[0]
+        else:
+            errors.append(ParseError(offset, index, '缺少 hs_Character'))
+        buffers.append(row, character)
+        count += 1
+    return count
+
+
+def parse_pages(pages, capacity=1024):
+    """
+    按 offset 顺序解析全部页面
+
+    参数:
+        pages (list): hurun_fetch.Page 列表
+        capacity (int): 缓冲区初始容量，通常设为 总条数
+
+    返回:
+        tuple: (DataFrame, ParseError 列表)
+    """
+    buffers = ColumnBuffers(capacity)
+    errors = []
+    for page in pages:
+        parse_page(page.body, buffers, page.offset, errors)
+    return buffers.to_frame(), errors
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+REGION_LEVELS = ['国家', '省份', '城市']
+
+
+def split_birthplace(series):
+    """
+    将 '中国-福建-龙岩' 形式的出生地拆分为 国家/省份/城市 三个分类列
+
+    只对不重复的出生地字符串做一次拆分，再通过分类编码广播到每一行
+
+    参数:
+        series (Series): 出生地列
+
+    返回:
+        DataFrame: 国家、省份、城市三列，均为分类类型，缺失层级为 NaN
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    codes = series.cat.codes.to_numpy()
+    if len(series.cat.categories) == 0:
+        return pd.DataFrame({level: pd.Categorical([None] * len(series)) for level in REGION_LEVELS},
+                            index=series.index)
+    parts = series.cat.categories.to_series().str.split('-', n=2, expand=True)
+    parts = parts.reindex(columns=range(len(REGION_LEVELS)))
+
+    result = {}
+    for i, level in enumerate(REGION_LEVELS):
+        level_cat = pd.Categorical(parts[i].str.strip().replace('', np.nan))
+        level_codes = level_cat.codes.take(codes)
+        level_codes[codes < 0] = -1
+        result[level] = pd.Categorical.from_codes(level_codes, level_cat.categories)
+    return pd.DataFrame(result, index=series.index)
+
+
+class RegionIndex:
+    """
+    出生地的 国家/省份/城市 索引
+
+    每个层级按分类编码对行号做一次稳定排序，记录每个取值对应的行区间，
+    之后按省份或城市的筛选和汇总都只是数组切片和 bincount
+
+    参数:
+        birthplace (Series): 出生地列
+    """
+
+    def __init__(self, birthplace):
+        self.regions = split_birthplace(birthplace)
+        self._codes = {}
+        self._order = {}
+        self._offsets = {}
+        for level in REGION_LEVELS:
+            codes = self.regions[level].cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(self.regions[level].cat.categories))
+            self._codes[level] = codes
+            self._order[level] = np.argsort(codes, kind='stable')[(codes < 0).sum():]
+            self._offsets[level] = np.concatenate([[0], np.cumsum(counts)])
+
+    def categories(self, level):
+        """某层级的全部取值"""
+        return self.regions[level].cat.categories
+
+    def rows(self, level, value):
+        """
+        取得某个省份/城市对应的行号（按原顺序）
+
+        参数:
+            level (str): '国家'、'省份' 或 '城市'
+            value (str): 取值，例如 '浙江'
+
+        返回:
+            ndarray: 行号数组，可直接用于 df.iloc
+        """
+        categories = self.categories(level)
+        if value not in categories:
+            return np.empty(0, dtype=np.intp)
+        code = categories.get_loc(value)
+        start, end = self._offsets[level][code], self._offsets[level][code + 1]
+        return self._order[level][start:end]
+
+    def counts(self, level, mask=None):
+        """
+        按层级计数，降序
+
+        参数:
+            mask (ndarray): 可选的布尔行过滤
+        """
+        codes = self._codes[level]
+        valid = codes >= 0 if mask is None else mask & (codes >= 0)
+        counts = np.bincount(codes[valid], minlength=len(self.categories(level)))
+        result = pd.Series(counts, index=pd.Index(self.categories(level), name=level), name='count')
+        return result[result > 0].sort_values(ascending=False, kind='stable')
+
+    def rollup(self, level, values, mask=None):
+        """
+        按层级对数值列求和、计数和均值
+
+        参数:
+            values (array-like): 与数据行对齐的数值，例如财富
+            mask (ndarray): 可选的布尔行过滤
+
+        返回:
+            DataFrame: 人数、总和、均值，按总和降序
+        """
+        values = np.asarray(values, dtype='float64')
+        codes = self._codes[level]
+        valid = (codes >= 0) & ~np.isnan(values)
+        if mask is not None:
+            valid &= mask
+        n = len(self.categories(level))
+        count = np.bincount(codes[valid], minlength=n)
+        total = np.bincount(codes[valid], weights=values[valid], minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+        result = pd.DataFrame({'人数': count, '总和': total, '均值': mean},
+                              index=pd.Index(self.categories(level), name=level))
+        return result[count > 0].sort_values('总和', ascending=False, kind='stable')
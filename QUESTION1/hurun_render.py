@@ -0,0 +1,242 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+# 强制使用非交互式后端，服务器上渲染不会阻塞
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+# 设置matplotlib支持中文
+plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'DejaVu Sans']
+plt.rcParams['axes.unicode_minus'] = False
+
+# 输出目标: 文件名后缀、输出格式、分辨率
+RenderTarget = namedtuple('RenderTarget', ['suffix', 'fmt', 'dpi'])
+
+# 预置输出目标：快速低分辨率预览和高分辨率存档
+PREVIEW = RenderTarget('_preview', 'png', 72)
+ARCHIVE = RenderTarget('', 'png', 300)
+
+
+def draw_industry_figure(summary):
+    """绘制4子图的行业分析图"""
+    industry_count = summary.industry_count
+    industry_wealth = summary.industry_wealth
+    industry_avg_wealth = summary.industry_avg_wealth
+
+    # 可视化：行业富豪数量分布
+    fig = plt.figure(figsize=(15, 10))
+
+    # 子图1：行业富豪数量柱状图
+    plt.subplot(2, 2, 1)
+    top_industries = industry_count.head(10)
+    bars = plt.bar(range(len(top_industries)), top_industries.values, color='skyblue')
+    plt.title('各行业富豪数量分布（前10名）', fontsize=14, fontweight='bold')
+    plt.xlabel('行业名称')
+    plt.ylabel('富豪数量')
+    plt.xticks(range(len(top_industries)), top_industries.index, rotation=45, ha='right')
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 0.5,
+                     str(int(height)), ha='center', va='bottom')
+
+    # 子图2：行业财富总值柱状图
+    plt.subplot(2, 2, 2)
+    top_wealth_industries = industry_wealth.head(10)
+    bars = plt.bar(range(len(top_wealth_industries)), top_wealth_industries.values, color='lightgreen')
+    plt.title('各行业财富总值分布（前10名）', fontsize=14, fontweight='bold')
+    plt.xlabel('行业名称')
+    plt.ylabel('财富总值（亿元）')
+    plt.xticks(range(len(top_wealth_industries)), top_wealth_industries.index, rotation=45, ha='right')
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 50,
+                     f'{int(height):,}', ha='center', va='bottom')
+
+    # 子图3：行业平均财富柱状图
+    plt.subplot(2, 2, 3)
+    top_avg_wealth = industry_avg_wealth.head(10)
+    bars = plt.bar(range(len(top_avg_wealth)), top_avg_wealth.values, color='orange')
+    plt.title('各行业平均财富分布（前10名）', fontsize=14, fontweight='bold')
+    plt.xlabel('行业名称')
+    plt.ylabel('平均财富（亿元）')
+    plt.xticks(range(len(top_avg_wealth)), top_avg_wealth.index, rotation=45, ha='right')
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 5,
+                     f'{int(height):,}', ha='center', va='bottom')
+
+    # 子图4：行业富豪数量vs平均财富散点图
+    plt.subplot(2, 2, 4)
+    industry_stats = pd.DataFrame({
+        '富豪数量': industry_count,
+        '平均财富': industry_avg_wealth,
+        '财富总值': industry_wealth
+    }).dropna()
+
+    plt.scatter(industry_stats['富豪数量'], industry_stats['平均财富'],
+                s=industry_stats['财富总值'] / 100, alpha=0.6, c='red')
+    plt.title('行业富豪数量 vs 平均财富关系', fontsize=14, fontweight='bold')
+    plt.xlabel('富豪数量')
+    plt.ylabel('平均财富（亿元）')
+
+    plt.tight_layout()
+    return fig
+
+
+def draw_profile_figure(summary):
+    """绘制9子图的多维度分析图"""
+    gender_dist = summary.gender_dist
+    age_dist = summary.age_dist
+    birthplace_dist = summary.birthplace_dist
+    wealth_dist = summary.wealth_dist
+
+    # 可视化：多维度分析
+    fig = plt.figure(figsize=(20, 15))
+
+    # 子图1：性别分布饼图
+    plt.subplot(3, 3, 1)
+    plt.pie(gender_dist.values, labels=gender_dist.index, autopct='%1.1f%%', startangle=90)
+    plt.title('富豪性别分布', fontsize=14, fontweight='bold')
+
+    # 子图2：年龄分布柱状图
+    plt.subplot(3, 3, 2)
+    bars = plt.bar(range(len(age_dist)), age_dist.values, color='lightcoral')
+    plt.title('富豪年龄分布', fontsize=14, fontweight='bold')
+    plt.xlabel('年龄分组')
+    plt.ylabel('人数')
+    plt.xticks(range(len(age_dist)), age_dist.index, rotation=45)
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 1,
+                     str(int(height)), ha='center', va='bottom')
+
+    # 子图3：出生地分布柱状图
+    plt.subplot(3, 3, 3)
+    top_birthplaces = birthplace_dist.head(8)
+    bars = plt.bar(range(len(top_birthplaces)), top_birthplaces.values, color='lightblue')
+    plt.title('富豪出生地分布（前8名）', fontsize=14, fontweight='bold')
+    plt.xlabel('出生地')
+    plt.ylabel('人数')
+    plt.xticks(range(len(top_birthplaces)), top_birthplaces.index, rotation=45, ha='right')
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 0.5,
+                     str(int(height)), ha='center', va='bottom')
+
+    # 子图4：财富分布柱状图
+    plt.subplot(3, 3, 4)
+    bars = plt.bar(range(len(wealth_dist)), wealth_dist.values, color='lightgreen')
+    plt.title('富豪财富分布', fontsize=14, fontweight='bold')
+    plt.xlabel('财富分组')
+    plt.ylabel('人数')
+    plt.xticks(range(len(wealth_dist)), wealth_dist.index, rotation=45)
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 0.5,
+                     str(int(height)), ha='center', va='bottom')
+
+    # 子图5：性别vs平均财富
+    plt.subplot(3, 3, 5)
+    gender_wealth = summary.gender_wealth
+    bars = plt.bar(gender_wealth.index, gender_wealth.values, color=['pink', 'lightblue'])
+    plt.title('不同性别平均财富对比', fontsize=14, fontweight='bold')
+    plt.ylabel('平均财富（亿元）')
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 10,
+                     f'{int(height):,}', ha='center', va='bottom')
+
+    # 子图6：年龄vs平均财富
+    plt.subplot(3, 3, 6)
+    age_wealth = summary.age_wealth
+    bars = plt.bar(range(len(age_wealth)), age_wealth.values, color='gold')
+    plt.title('不同年龄组平均财富对比', fontsize=14, fontweight='bold')
+    plt.xlabel('年龄分组')
+    plt.ylabel('平均财富（亿元）')
+    plt.xticks(range(len(age_wealth)), age_wealth.index, rotation=45)
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        if not pd.isna(height):  # 检查是否为NaN
+            plt.text(bar.get_x() + bar.get_width() / 2, height + 10,
+                     f'{int(height):,}', ha='center', va='bottom')
+
+    # 子图7：年龄分布热力图
+    plt.subplot(3, 3, 7)
+    age_gender_cross = summary.age_gender_cross
+    sns.heatmap(age_gender_cross, annot=True, fmt='d', cmap='YlOrRd')
+    plt.title('年龄-性别分布热力图', fontsize=14, fontweight='bold')
+
+    # 子图8：财富-年龄散点图
+    plt.subplot(3, 3, 8)
+    plt.scatter(summary.clean_age, summary.clean_wealth, alpha=0.6, c='purple')
+    plt.title('财富与年龄关系散点图', fontsize=14, fontweight='bold')
+    plt.xlabel('年龄')
+    plt.ylabel('财富（亿元）')
+
+    # 子图9：行业-性别分布
+    plt.subplot(3, 3, 9)
+    industry_gender_cross = summary.industry_gender_cross
+    industry_gender_cross.plot(kind='bar', stacked=True, ax=plt.gca())
+    plt.title('主要行业性别分布', fontsize=14, fontweight='bold')
+    plt.xlabel('行业名称')
+    plt.ylabel('人数')
+    plt.xticks(rotation=45, ha='right')
+    plt.legend(title='性别')
+
+    plt.tight_layout()
+    return fig
+
+
+# 图表名称 -> 绘制函数
+FIGURES = {
+    '行业分析': draw_industry_figure,
+    '多维度分析': draw_profile_figure
+}
+
+
+def render_figure(name, summary, target, out_dir='.'):
+    """
+    在当前进程中绘制并保存一张图表
+
+    返回:
+        str: 输出文件路径
+    """
+    fig = FIGURES[name](summary)
+    path = os.path.join(out_dir, f'{name}{target.suffix}.{target.fmt}')
+    fig.savefig(path, format=target.fmt, dpi=target.dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def render_all(summary, targets=(ARCHIVE,), names=None, out_dir='.', max_workers=None):
+    """
+    在进程池中并行渲染 图表 x 输出目标 的全部组合
+
+    参数:
+        summary (HurunSummary): 汇总统计结果
+        targets (list): RenderTarget 列表，例如 [PREVIEW, ARCHIVE]
+        names (list): 需要渲染的图表名称，None 表示全部
+        out_dir (str): 输出目录
+        max_workers (int): 进程数，None 表示使用 CPU 核数
+
+    返回:
+        list: 按提交顺序排列的输出文件路径
+    """
+    names = list(FIGURES) if names is None else names
+    jobs = [(name, target) for name in names for target in targets]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(render_figure, name, summary, target, out_dir) for name, target in jobs]
+        return [f.result() for f in futures]
@@ -0,0 +1,45 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# 列类型定义
+CATEGORY_COLUMNS = ['性别', '出生地', '行业名称']
+NUMERIC_COLUMNS = {
+    '排名': 'Int32',
+    '年龄': 'float32',
+    '财富': 'float64'
+}
+COLUMNS = ['排名', '姓名', '性别', '年龄', '出生地', '财富', '公司名称', '行业名称']
+
+
+def normalize_types(df):
+    """
+    统一列类型：性别/出生地/行业名称为分类类型，排名/年龄/财富为数值类型
+
+    参数:
+        df (DataFrame): 原始数据
+
+    返回:
+        DataFrame: 类型规范化后的数据
+    """
+    df = df[COLUMNS].copy()
+    for col, dtype in NUMERIC_COLUMNS.items():
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def save_table(df, path):
+    """
+    以 Feather 列式格式保存数据
+
+    不压缩写入，使读取时可以直接内存映射，无需解压拷贝
+    """
+    feather.write_feather(normalize_types(df), path, compression='uncompressed')
+
+
+def load_table(path):
+    """以内存映射方式读取 Feather 文件，分类列和数值列类型保持不变"""
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from hurun_region import RegionIndex
+
+# 分组区间，与 pd.cut(right=False) 一致为左闭右开
+AGE_BINS = [0, 30, 40, 50, 60, 70, 100]
+AGE_LABELS = ['30岁以下', '30-40岁', '40-50岁', '50-60岁', '60-70岁', '70岁以上']
+WEALTH_BINS = [0, 100, 200, 500, 1000, 5000, float('inf')]
+WEALTH_LABELS = ['100亿以下', '100-200亿', '200-500亿', '500-1000亿', '1000-5000亿', '5000亿以上']
+
+# 参与清洗的必填列
+CLEAN_COLUMNS = ['年龄', '性别', '出生地', '财富']
+
+
+class HurunSummary:
+    """
+    胡润榜单的汇总统计结果，供文字报告和图表共同读取
+
+    属性:
+        total (int): 总富豪数量
+        clean (int): 清洗后的有效数据量
+        industry_count (Series): 各行业富豪数量，降序
+        industry_wealth (Series): 各行业财富总值，降序
+        industry_avg_wealth (Series): 各行业平均财富，降序
+        gender_dist (Series): 性别分布
+        age_dist (Series): 年龄分组分布
+        birthplace_dist (Series): 出生地分布（前10名）
+        province_dist (Series): 出生省份分布
+        city_dist (Series): 出生城市分布（前10名）
+        province_wealth (DataFrame): 各出生省份的人数、财富总和与均值
+        region (RegionIndex): 出生地 国家/省份/城市 索引，用于地域筛选
+        wealth_dist (Series): 财富分组分布
+        gender_wealth (Series): 各性别平均财富
+        age_wealth (Series): 各年龄组平均财富
+        age_gender_cross (DataFrame): 年龄分组 x 性别 人数
+        industry_gender_cross (DataFrame): 主要行业 x 性别 人数
+        clean_age (ndarray): 有效数据的年龄
+        clean_wealth (ndarray): 有效数据的财富
+    """
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def _codes(series):
+    """取得分类编码和类别，缺失值编码为 -1"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    return series.cat.codes.to_numpy(), series.cat.categories
+
+
+def _bin_codes(values, bins):
+    """按左闭右开区间分箱，超出范围或缺失的值编码为 -1"""
+    codes = np.searchsorted(bins, values, side='right') - 1
+    codes[np.isnan(values) | (values < bins[0]) | (values >= bins[-1])] = -1
+    return codes
+
+
+def _count(codes, n, mask=None):
+    """按编码计数，编码为 -1 的行不计入"""
+    valid = codes >= 0 if mask is None else mask & (codes >= 0)
+    return np.bincount(codes[valid], minlength=n), valid
+
+
+def _cross(row_codes, col_codes, n_rows, n_cols, mask):
+    """两组编码的交叉计数"""
+    valid = mask & (row_codes >= 0) & (col_codes >= 0)
+    flat = row_codes[valid] * n_cols + col_codes[valid]
+    return np.bincount(flat, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+
+def _sorted_counts(counts, labels, name, drop_zero=True):
+    result = pd.Series(counts, index=pd.Index(labels, name=name), name='count')
+    if drop_zero:
+        result = result[result > 0]
+    return result.sort_values(ascending=False, kind='stable')
+
+
+def summarize(df, top_industries=5):
+    """
+    一次性计算行业、性别、年龄分组、财富分组和出生地的全部统计量
+
+    所有统计都基于同一组分类编码，通过 np.bincount 向量化完成，
+    不再对整张表重复执行 value_counts/groupby/cut/crosstab
+
+    参数:
+        df (DataFrame): hurun_store 规范化后的数据
+        top_industries (int): 行业-性别交叉表中保留的主要行业数
+
+    返回:
+        HurunSummary: 汇总结果
+    """
+    wealth = df['财富'].to_numpy(dtype='float64', na_value=np.nan)
+    age = df['年龄'].to_numpy(dtype='float64', na_value=np.nan)
+    ind_codes, industries = _codes(df['行业名称'])
+    gender_codes, genders = _codes(df['性别'])
+    birth_codes, birthplaces = _codes(df['出生地'])
+    region = RegionIndex(df['出生地'])
+    age_codes = _bin_codes(age, AGE_BINS)
+    wealth_codes = _bin_codes(wealth, WEALTH_BINS)
+
+    n_ind, n_gender = len(industries), len(genders)
+    has_wealth = ~np.isnan(wealth)
+    clean = ~np.isnan(age) & (gender_codes >= 0) & (birth_codes >= 0) & has_wealth
+
+    # 行业统计（全部数据）
+    ind_count, ind_valid = _count(ind_codes, n_ind)
+    wealth_valid = ind_valid & has_wealth
+    ind_wealth_sum = np.bincount(ind_codes[wealth_valid], weights=wealth[wealth_valid], minlength=n_ind)
+    ind_wealth_n = np.bincount(ind_codes[wealth_valid], minlength=n_ind)
+    observed = ind_count > 0
+
+    industry_count = _sorted_counts(ind_count, industries, '行业名称')
+    industry_wealth = pd.Series(ind_wealth_sum[observed], index=pd.Index(industries[observed], name='行业名称'),
+                                name='财富').sort_values(ascending=False, kind='stable')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ind_wealth_mean = ind_wealth_sum / ind_wealth_n
+    industry_avg_wealth = pd.Series(ind_wealth_mean[observed], index=pd.Index(industries[observed], name='行业名称'),
+                                    name='财富').sort_values(ascending=False, kind='stable')
+
+    # 人口统计（清洗后数据）
+    gender_count, _ = _count(gender_codes, n_gender, clean)
+    age_count, age_valid = _count(age_codes, len(AGE_LABELS), clean)
+    birth_count, _ = _count(birth_codes, len(birthplaces), clean)
+    wealth_count, _ = _count(wealth_codes, len(WEALTH_LABELS), clean)
+
+    gender_wealth_sum = np.bincount(gender_codes[clean], weights=wealth[clean], minlength=n_gender)
+    age_wealth_sum = np.bincount(age_codes[age_valid], weights=wealth[age_valid], minlength=len(AGE_LABELS))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gender_wealth = gender_wealth_sum / gender_count
+        age_wealth = age_wealth_sum / age_count
+
+    # 交叉统计
+    age_gender = _cross(age_codes, gender_codes, len(AGE_LABELS), n_gender, clean)
+    top_codes = np.flatnonzero(np.isin(industries, industry_count.index[:top_industries]))
+    ind_gender = _cross(ind_codes, gender_codes, n_ind, n_gender, clean)[top_codes]
+
+    gender_seen = gender_count > 0
+    gender_index = pd.Index(genders[gender_seen], name='性别')
+    age_index = pd.CategoricalIndex(AGE_LABELS, categories=AGE_LABELS, ordered=True, name='年龄分组')
+    age_gender_cross = pd.DataFrame(age_gender[:, gender_seen], index=age_index, columns=gender_index)
+    industry_gender_cross = pd.DataFrame(ind_gender[:, gender_seen], columns=gender_index,
+                                         index=pd.Index(industries[top_codes], name='行业名称'))
+
+    return HurunSummary(
+        total=len(df),
+        clean=int(clean.sum()),
+        industry_count=industry_count,
+        industry_wealth=industry_wealth,
+        industry_avg_wealth=industry_avg_wealth,
+        gender_dist=_sorted_counts(gender_count, genders, '性别'),
+        age_dist=_sorted_counts(age_count, AGE_LABELS, '年龄分组', drop_zero=False),
+        birthplace_dist=_sorted_counts(birth_count, birthplaces, '出生地').head(10),
+        province_dist=region.counts('省份', clean),
+        city_dist=region.counts('城市', clean).head(10),
+        province_wealth=region.rollup('省份', wealth, clean),
+        region=region,
+        wealth_dist=_sorted_counts(wealth_count, WEALTH_LABELS, '财富分组', drop_zero=False),
+        gender_wealth=pd.Series(gender_wealth[gender_seen], index=gender_index, name='财富'),
+        age_wealth=pd.Series(age_wealth, index=age_index, name='财富'),
+        age_gender_cross=age_gender_cross[age_gender_cross.sum(axis=1) > 0],
+        industry_gender_cross=industry_gender_cross,
+        clean_age=age[clean],
+        clean_wealth=wealth[clean]
+    )
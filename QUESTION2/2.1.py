@@ -1,175 +1,469 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pandas as pd
+import numpy as np
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
 import html
+import random
+import threading
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm  # 添加进度条支持
 
+try:
+    from lxml import html as lxml_html
+except ImportError:  # 未安装 lxml 时使用 BeautifulSoup 解析
+    lxml_html = None
 
-def scrape_weather_data(year, month):
+from weather_archive import ARCHIVE_DIR, RawArchive
+from weather_store import DATASET_DIR, read_partitions, upsert_partitions, write_partitions
+from weather_validate import find_gaps, validate_frame
+
+# 爬取范围：城市拼音与 tianqihoubao 的 URL 一致
+CITIES = ['dalian']
+START_YEAR = 2022
+END_YEAR = 2024
+
+# 预编译的正则和字符表
+CHARSET_RE = re.compile(r'charset=([\w-]+)')
+DIGITS_RE = re.compile(r'\d+')
+TEMP_RE = re.compile(r'(-?\d+)℃\s*/\s*(-?\d+)℃')
+WEATHER_STRIP = str.maketrans('', '', '\n\r ')
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
+
+
+class TokenBucket:
     """
-    爬取指定年月的大连历史天气数据
+    线程共享的令牌桶限速器
+
+    参数:
+        rate (float): 每秒补充的令牌数，即长期平均请求速率
+        capacity (int): 桶容量，即允许的最大突发请求数
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取得一个令牌，令牌不足时阻塞等待"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size=8):
+    """创建带连接池的共享会话"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def backoff_delay(retry, base=1.0, cap=60.0):
+    """指数退避 + 全抖动：在 [0, min(cap, base * 2^retry)] 内随机取值"""
+    return random.uniform(0, min(cap, base * 2 ** retry))
+
+
+def fetch_with_retry(session, url, bucket=None, retries=3, timeout=10):
+    """
+    带限速和指数退避重试的 GET 请求
+
+    参数:
+        session (Session): 共享会话
+        url (str): 请求地址
+        bucket (TokenBucket): 限速器，None 表示不限速
+        retries (int): 最大尝试次数
+        timeout (float): 单次请求超时时间（秒）
+
+    返回:
+        Response: 成功的响应
+    """
+    for retry in range(retries):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()  # 检查请求是否成功
+            return response
+        except requests.RequestException:
+            if retry == retries - 1:
+                raise
+            time.sleep(backoff_delay(retry))
+
+
+def extract_table_cells(page_html):
+    """
+    提取页面第一个表格中每行的单元格文本（跳过表头）
+
+    每个单元格的文本为各文本节点去除首尾空白后直接拼接，与 BeautifulSoup 的
+    get_text(strip=True) 结果一致。安装了 lxml 时使用 lxml，否则退回 BeautifulSoup
+
+    返回:
+        list: 每行的单元格文本列表，未找到表格时返回 None
+    """
+    if lxml_html is not None:
+        tables = lxml_html.fromstring(page_html).xpath('//table')
+        if not tables:
+            return None
+        return [[''.join(t.strip() for t in td.itertext()) for td in tr.xpath('.//td')]
+                for tr in tables[0].xpath('.//tr')[1:]]
+
+    table = BeautifulSoup(page_html, 'html.parser').find('table')
+    if not table:
+        return None
+    return [[td.get_text(strip=True) for td in tr.find_all('td')] for tr in table.find_all('tr')[1:]]
+
+
+def parse_dates(date_strs):
+    """
+    批量解析日期字符串为 'YYYY-MM-DD'
+
+    先按 '%Y年%m月%d日' 整列向量化解析，解析失败的再逐个用数字提取兜底
+
+    返回:
+        list: 与输入等长，无法解析的位置为 None
+    """
+    parsed = pd.to_datetime(pd.Series(date_strs, dtype=object), format="%Y年%m月%d日", errors='coerce')
+    dates = parsed.dt.strftime("%Y-%m-%d").tolist()
+    for i in np.flatnonzero(parsed.isna().to_numpy()):
+        # 尝试其他日期格式
+        nums = DIGITS_RE.findall(date_strs[i])
+        if len(nums) >= 3:
+            dates[i] = f"{nums[0]}-{nums[1].zfill(2)}-{nums[2].zfill(2)}"
+        else:
+            print(f"警告: 无法解析日期 '{date_strs[i]}'，跳过该记录")
+            dates[i] = None
+    return dates
+
+
+def split_pair(text):
+    """拆分 '白天/夜间' 形式的文本，缺少夜间部分时沿用白天"""
+    parts = [p.strip() for p in text.split('/')]
+    day = parts[0] if parts else ''
+    night = parts[1] if len(parts) > 1 else day
+    return day, night
+
+
+def parse_weather_html(page_html):
+    """
+    解析天气页面的数据表格
+
+    参数:
+        page_html (str): 解码后的页面HTML
+
+    返回:
+        list: 包含每日天气数据的字典列表，未找到表格时返回 None
+    """
+    rows = extract_table_cells(page_html)
+    if rows is None:
+        return None
+
+    # 过滤列数不足或日期为空的行
+    rows = [cols for cols in rows if len(cols) >= 4 and cols[0]]
+    dates = parse_dates([cols[0] for cols in rows])
+
+    data = []
+    for cols, date in zip(rows, dates):
+        if date is None:
+            continue
+
+        # 提取天气信息
+        day_weather, night_weather = split_pair(cols[1].translate(WEATHER_STRIP))
+
+        # 提取温度
+        temp_match = TEMP_RE.search(cols[2])
+        if temp_match:
+            max_temp = int(temp_match.group(1))
+            min_temp = int(temp_match.group(2))
+        else:
+            max_temp = min_temp = None
+
+        # 处理风力
+        day_wind, night_wind = split_pair(cols[3])
+
+        data.append({
+            'date': date,
+            'day_weather': day_weather,
+            'night_weather': night_weather,
+            'max_temp': max_temp,
+            'min_temp': min_temp,
+            'day_wind': day_wind,
+            'night_wind': night_wind
+        })
+    return data
+
+
+def scrape_weather_data(year, month, session=None, bucket=None, city='dalian', archive=None):
+    """
+    爬取指定城市、年月的历史天气数据
 
     参数:
         year (int): 年份
         month (int): 月份
+        session (Session): 共享会话，None 时临时创建
+        bucket (TokenBucket): 共享限速器，None 表示不限速
+        city (str): 城市拼音，与 tianqihoubao 的 URL 一致，例如 'dalian'
+        archive (RawArchive): 原始页面归档，None 表示不归档
 
     返回:
-        list: 包含每日天气数据的字典列表
+        list: 包含每日天气数据的字典列表，请求失败时返回 None
     """
-    url = f"https://www.tianqihoubao.com/lishi/dalian/month/{year}{month:02d}.html"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
+    url = f"https://www.tianqihoubao.com/lishi/{city}/month/{year}{month:02d}.html"
+    session = session or make_session(1)
 
     try:
         # 添加请求重试机制
-        for retry in range(3):
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()  # 检查请求是否成功
-                break
-            except (requests.RequestException, requests.Timeout) as e:
-                if retry == 2:
-                    raise
-                time.sleep(5)  # 等待5秒后重试
+        response = fetch_with_retry(session, url, bucket)
 
         # 检测页面编码
-        if 'charset' in response.headers.get('content-type', '').lower():
-            encoding = re.search(r'charset=([\w-]+)', response.headers['content-type'].lower()).group(1)
-        else:
-            encoding = 'gb18030'  # 默认编码
+        charset = CHARSET_RE.search(response.headers.get('content-type', '').lower())
+        response.encoding = charset.group(1) if charset else 'gb18030'  # 默认编码
 
-        response.encoding = encoding
-        soup = BeautifulSoup(response.text, 'html.parser')
-        table = soup.find('table')
+        # 归档原始页面，解析规则变化时可离线重新解析
+        if archive is not None:
+            archive.put(city, year, month, response.content, response.encoding)
 
-        if not table:
+        data = parse_weather_html(response.text)
+        if data is None:
             print(f"警告: 未找到 {year}-{month:02d} 的数据表格")
             return []
-
-        data = []
-        rows = table.find_all('tr')[1:]  # 跳过表头
-
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) < 4:
-                continue
-
-            # 提取并清理日期
-            date_td = cols[0]
-            date_str = ''.join(date_td.stripped_strings)
-
-            if not date_str:
-                continue
-
-            # 解析日期
-            try:
-                date = datetime.strptime(date_str, "%Y年%m月%d日").strftime("%Y-%m-%d")
-            except ValueError:
-                # 尝试其他日期格式
-                nums = re.findall(r'\d+', date_str)
-                if len(nums) >= 3:
-                    date = f"{nums[0]}-{nums[1].zfill(2)}-{nums[2].zfill(2)}"
-                else:
-                    print(f"警告: 无法解析日期 '{date_str}'，跳过该记录")
-                    continue
-
-            # 提取天气信息
-            weather = cols[1].get_text(strip=True).replace('\n', '').replace('\r', '').replace(' ', '')
-            temp = cols[2].get_text(strip=True)
-            wind = cols[3].get_text(strip=True)
-
-            # 处理天气分割
-            weather_parts = [p.strip() for p in weather.split('/')]
-            day_weather = weather_parts[0] if weather_parts else ''
-            night_weather = weather_parts[1] if len(weather_parts) > 1 else day_weather
-
-            # 提取温度
-            temp_match = re.search(r'(-?\d+)℃\s*/\s*(-?\d+)℃', temp)
-            if temp_match:
-                max_temp = int(temp_match.group(1))
-                min_temp = int(temp_match.group(2))
-            else:
-                max_temp = min_temp = None
-
-            # 处理风力
-            wind_parts = [p.strip() for p in wind.split('/')]
-            day_wind = wind_parts[0] if wind_parts else ''
-            night_wind = wind_parts[1] if len(wind_parts) > 1 else day_wind
-
-            data.append({
-                'date': date,
-                'day_weather': day_weather,
-                'night_weather': night_weather,
-                'max_temp': max_temp,
-                'min_temp': min_temp,
-                'day_wind': day_wind,
-                'night_wind': night_wind
-            })
-
         return data
 
     except Exception as e:
         print(f"错误: 爬取 {year}-{month:02d} 数据失败 - {str(e)}")
-        return []
+        return None
 
 
-def validate_data(data):
+def crawl_tasks(tasks, max_workers=4, rate=0.5, burst=2, archive=None):
     """
-    验证并清理数据
+    并发爬取多个 城市x年月 任务，所有线程共享一个连接池会话和一个令牌桶
 
     参数:
-        data (list): 原始数据列表
+        tasks (list): (city, year, month) 列表
+        max_workers (int): 同时在途的最大请求数
+        rate (float): 每秒平均请求数
+        burst (int): 允许的突发请求数
+        archive (RawArchive): 原始页面归档，None 表示不归档
 
     返回:
-        list: 清理后的数据列表
+        tuple: (按任务顺序拼接、带 city 字段的每日天气数据, 失败的 (city, year, month) 列表)
     """
-    validated = []
-    for record in data:
-        # 检查必填字段
-        if not record.get('date') or not record.get('day_weather'):
+    bucket = TokenBucket(rate, burst)
+    results = {}
+    with make_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(scrape_weather_data, year, month, session, bucket, city, archive): (city, year, month)
+                   for city, year, month in tasks}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="月份进度"):
+            results[futures[future]] = future.result()
+    if archive is not None:
+        archive.compact()
+
+    all_data = []
+    failed = []
+    for task in tasks:
+        if results[task] is None:
+            failed.append(task)
             continue
+        for record in results[task]:
+            record['city'] = task[0]
+            all_data.append(record)
+    return all_data, failed
 
-        # 确保温度在合理范围内
-        if record['max_temp'] is not None and (record['max_temp'] < -50 or record['max_temp'] > 50):
-            record['max_temp'] = None
-        if record['min_temp'] is not None and (record['min_temp'] < -50 or record['min_temp'] > 50):
-            record['min_temp'] = None
 
-        validated.append(record)
-    return validated
+def crawl_cities(cities, start_year, end_year, **kwargs):
+    """
+    爬取多个城市在 [start_year, end_year] 内的全部月份
 
+    不同城市的月份交错排列，使并发请求分散到各城市
 
-def main():
-    # 爬取数据
+    返回:
+        tuple: (带 city 字段的每日天气数据, 失败的 (city, year, month) 列表)
+    """
+    tasks = [(city, year, month)
+             for year in range(start_year, end_year + 1)
+             for month in range(1, 13)
+             for city in cities]
+    return crawl_tasks(tasks, **kwargs)
+
+
+def crawl_months(year_months, city='dalian', **kwargs):
+    """并发爬取单个城市的多个年月"""
+    return crawl_tasks([(city, year, month) for year, month in year_months], **kwargs)
+
+
+# 重新解析进程中共享的归档实例
+_worker_archive = None
+
+
+def _init_reparse_worker(archive_root):
+    global _worker_archive
+    _worker_archive = RawArchive(archive_root)
+
+
+def reparse_month(city, year, month):
+    """在工作进程中重新解析一个归档页面"""
+    data = parse_weather_html(_worker_archive.get(city, year, month))
+    if data is None:
+        print(f"警告: 归档的 {city} {year}-{month:02d} 页面中未找到数据表格")
+        return []
+    for record in data:
+        record['city'] = city
+    return data
+
+
+def reparse_archive(archive_root, cities=None, years=None, max_workers=None):
+    """
+    不访问网络，在进程池中并行重新解析归档的原始页面
+
+    参数:
+        archive_root (str): 归档目录
+        cities (list): 只解析这些城市，None 表示全部
+        years (list): 只解析这些年份，None 表示全部
+        max_workers (int): 进程数，None 表示使用 CPU 核数
+
+    返回:
+        list: 按 城市/年/月 排序、带 city 字段的每日天气数据
+    """
+    tasks = RawArchive(archive_root).entries(cities, years)
     all_data = []
-    years = range(2022, 2025)  # 2022-2024年
-    months = range(1, 13)  # 1-12月
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_reparse_worker,
+                             initargs=(archive_root,)) as pool:
+        results = pool.map(reparse_month, *zip(*tasks), chunksize=8) if tasks else []
+        for data in tqdm(results, total=len(tasks), desc="解析进度"):
+            all_data.extend(data)
+    return all_data
 
-    print("开始爬取大连历史天气数据...")
 
-    for year in tqdm(years, desc="年份进度"):
-        for month in tqdm(months, desc=f"{year}年月份进度", leave=False):
-            monthly_data = scrape_weather_data(year, month)
-            all_data.extend(monthly_data)
-            time.sleep(2 + 3 * random.random())  # 随机延迟2-5秒
+def month_range(start, end):
+    """[start, end] 之间（含首尾所在月）的全部 (year, month)"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
 
-    # 数据验证和清理
-    print("\n数据爬取完成，正在进行验证和清理...")
-    all_data = validate_data(all_data)
 
-    if not all_data:
-        print("错误: 没有获取到有效数据！")
+def report_failures(failed):
+    """打印重试后仍失败的月份，这些月份的数据缺失"""
+    for city, year, month in failed:
+        print(f"{city} {year}-{month:02d} 获取失败")
+
+
+def drop_after_failures(df, failed):
+    """
+    丢弃每个城市第一个失败月份及之后的数据
+
+    增量模式按已存储的最后日期决定下次从哪里开始爬取，如果越过失败的月份写入后面的数据，
+    这个月份以后就不会再被爬取；截断后下次运行会从失败的月份重新开始
+    """
+    first_failed = {}
+    for city, year, month in failed:
+        first_failed[city] = min(first_failed.get(city, (year, month)), (year, month))
+    keep = pd.Series(True, index=df.index)
+    for city, (year, month) in first_failed.items():
+        keep &= (df['city'] != city) | (df['date'] < datetime(year, month, 1))
+    return df[keep]
+
+
+def incremental_tasks(cities, today, root=DATASET_DIR):
+    """
+    增量更新需要爬取的 (city, year, month)
+
+    从已存储数据最后日期的下一天所在月份爬到当前月份；尚无数据的城市从 START_YEAR 开始。
+    已存储数据中间的日期缺口（find_gaps）和 START_YEAR 1 月 1 日到第一条数据之间缺失的月份
+    也重新爬取，补上以前失败的月份
+
+    参数:
+        cities (list): 城市拼音列表
+        today (date): 当前日期
+    """
+    first_day = datetime(START_YEAR, 1, 1)
+    tasks = []
+    for city in cities:
+        dates = pd.to_datetime(read_partitions([city], root=root, columns=['date'])['date'])
+        if dates.empty:
+            tasks.extend((city, year, month) for year, month in month_range(first_day, today))
+            continue
+
+        months = set(month_range(dates.max() + timedelta(days=1), today))
+        if dates.min() > first_day:
+            months.update(month_range(first_day, dates.min() - timedelta(days=1)))
+        gaps = find_gaps(pd.DataFrame({'city': city, 'date': dates}))
+        for start, end in zip(gaps['缺失起始'], gaps['缺失结束']):
+            months.update(month_range(start, end))
+        tasks.extend((city, year, month) for year, month in sorted(months))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='爬取 tianqihoubao 历史天气数据')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--reparse', action='store_true', help='不联网，从原始页面归档重新解析生成数据')
+    mode.add_argument('--incremental', action='store_true',
+                      help='只爬取已存储数据之后缺失的月份和当前月份，并按日期合并到分区数据集；'
+                           f'导出的CSV仍只包含 {START_YEAR}-{END_YEAR} 年')
+    args = parser.parse_args()
+
+    failed = []
+    if args.reparse:
+        print(f"正在从 {ARCHIVE_DIR}/ 重新解析 {', '.join(CITIES)} 历史天气数据...")
+        all_data = reparse_archive(ARCHIVE_DIR, CITIES, range(START_YEAR, END_YEAR + 1))
+    elif args.incremental:
+        tasks = incremental_tasks(CITIES, datetime.now())
+        print(f"增量更新: 需要爬取 {len(tasks)} 个月份")
+        all_data, failed = crawl_tasks(tasks, archive=RawArchive(ARCHIVE_DIR))
+    else:
+        # 爬取数据
+        print(f"开始爬取 {', '.join(CITIES)} 历史天气数据...")
+        all_data, failed = crawl_cities(CITIES, START_YEAR, END_YEAR, archive=RawArchive(ARCHIVE_DIR))
+
+    if failed:
+        print(f"\n警告: {len(failed)} 个月份重试后仍获取失败，数据不完整:")
+        report_failures(failed)
+
+    if not all_data and args.incremental:
+        print("爬取失败，请稍后重试" if failed else "数据已是最新，无需更新")
         return
 
-    # 转换为DataFrame并保存
+    # 转换为DataFrame，日期列转换为datetime类型
     weather_df = pd.DataFrame(all_data)
-
-    # 转换日期列为datetime类型并排序
-    weather_df['date'] = pd.to_datetime(weather_df['date'], errors='coerce')
-    weather_df = weather_df.dropna(subset=['date']).sort_values('date')
+    if not weather_df.empty:
+        weather_df['date'] = pd.to_datetime(weather_df['date'], errors='coerce')
+        if args.incremental and failed:
+            # 不越过失败的月份写入，下次增量运行会从第一个失败的月份继续
+            weather_df = drop_after_failures(weather_df, failed)
+
+        # 数据验证和清理
+        print("\n数据获取完成，正在进行验证和清理...")
+        weather_df, report, gaps = validate_frame(weather_df)
+        print(report.to_string(index=False))
+        if len(gaps):
+            print(f"\n发现 {len(gaps)} 处日期缺口，共缺失 {gaps['缺失天数'].sum()} 天:")
+            print(gaps.to_string(index=False))
+
+    if weather_df.empty:
+        print("错误: 没有获取到有效数据！")
+        return
+    weather_df = weather_df.sort_values(['city', 'date'])
 
     # 数据预览
     print("\n数据预览:")
@@ -177,13 +471,28 @@ def main():
     print("\n数据统计信息:")
     print(weather_df.describe(include='all'))
 
-    # 保存数据
-    output_file = 'dalian_weather_2022_2024.csv'
-    weather_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-    print(f"\n成功保存 {len(weather_df)} 条天气数据到 {output_file}")
+    # 保存按 城市/年份 分区的数据集，增量模式下按 (city, date) 合并；
+    # 2.2-2.4 分析的是 START_YEAR-END_YEAR 的CSV，之后的新数据只进入分区数据集（供 2.5 使用）
+    if args.incremental:
+        paths = upsert_partitions(weather_df, DATASET_DIR)
+        weather_df = read_partitions(CITIES, range(START_YEAR, END_YEAR + 1), DATASET_DIR)
+    elif failed:
+        # 含失败月份的 城市/年份 分区与已有数据合并，保留以前爬到的该月数据；其余分区整体覆盖
+        failed_partitions = {(city, year) for city, year, _ in failed}
+        in_failed = pd.MultiIndex.from_arrays([weather_df['city'], weather_df['date'].dt.year]).isin(failed_partitions)
+        paths = (write_partitions(weather_df[~in_failed], DATASET_DIR)
+                 + upsert_partitions(weather_df[in_failed], DATASET_DIR))
+        weather_df = read_partitions(CITIES, range(START_YEAR, END_YEAR + 1), DATASET_DIR)
+    else:
+        paths = write_partitions(weather_df, DATASET_DIR)
+    print(f"\n已写入 {len(paths)} 个分区到 {DATASET_DIR}/")
+
+    # 每个城市另存一份与原格式一致的CSV
+    for city, city_df in weather_df.groupby('city'):
+        output_file = f'{city}_weather_{START_YEAR}_{END_YEAR}.csv'
+        city_df.drop(columns=['city']).to_csv(output_file, index=False, encoding='utf-8-sig')
+        print(f"成功保存 {len(city_df)} 条天气数据到 {output_file}")
 
 
 if __name__ == "__main__":
-    import random
-
     main()
\ No newline at end of file
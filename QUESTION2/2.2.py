@@ -1,18 +1,14 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib import rcParams
+from weather_agg import WeatherAggregates
+from weather_data import load_weather
+from weather_figure import ChartTemplate
 
-# 设置中文显示
-rcParams['font.sans-serif'] = ['SimHei']
-rcParams['axes.unicode_minus'] = False
+CITY = 'dalian'
 
 
 def load_data():
     """加载天气数据"""
     try:
-        df = pd.read_csv('dalian_weather_2022_2024.csv', parse_dates=['date'])
-        return df
+        return load_weather()
     except FileNotFoundError:
         print("请先运行任务一代码获取数据")
         exit()
@@ -20,14 +16,13 @@ def load_data():
 
 def analyze_temperature(df):
     """分析温度数据"""
-    # 提取月份
-    df['month'] = df['date'].dt.month
+    # 增量更新聚合缓存，只处理上次之后新增的日期；CSV 中已有日期的数据变化时自动重新聚合
+    aggregates = WeatherAggregates()
+    aggregates.update(df.assign(city=CITY))
 
-    # 计算每月平均温度
-    monthly_avg = df.groupby(['month']).agg({
-        'max_temp': 'mean',
-        'min_temp': 'mean'
-    }).reset_index()
+    # 每月平均温度取逐月气候平均值
+    normals = aggregates.climatology()
+    monthly_avg = normals.loc[normals['city'] == CITY, ['month', 'max_temp', 'min_temp']].reset_index(drop=True)
 
     # 保留2位小数
     monthly_avg['max_temp'] = monthly_avg['max_temp'].round(1)
@@ -36,39 +31,39 @@ def analyze_temperature(df):
     return monthly_avg
 
 
-def plot_temperature_trend(monthly_avg):
-    """绘制温度变化趋势图"""
-    plt.figure(figsize=(12, 6))
+def make_template():
+    """创建气温趋势图模板，可在多个城市间复用"""
+    return ChartTemplate((12, 6), '月份', '温度(℃)', grid=dict(visible=True, linestyle='--', alpha=0.6))
+
 
+def draw_temperature_trend(ax, monthly_avg):
+    """在坐标轴上绘制最高/最低气温折线和数字标签"""
     # 绘制最高气温折线
-    max_line = plt.plot(monthly_avg['month'], monthly_avg['max_temp'],
-                        label='平均最高气温', marker='o', linewidth=2, markersize=8)
+    max_line = ax.plot(monthly_avg['month'], monthly_avg['max_temp'],
+                       label='平均最高气温', marker='o', linewidth=2, markersize=8)
 
     # 绘制最低气温折线
-    min_line = plt.plot(monthly_avg['month'], monthly_avg['min_temp'],
-                        label='平均最低气温', marker='o', linewidth=2, markersize=8)
+    min_line = ax.plot(monthly_avg['month'], monthly_avg['min_temp'],
+                       label='平均最低气温', marker='o', linewidth=2, markersize=8)
 
     # 在坐标点上添加数字标签
     for x, y in zip(monthly_avg['month'], monthly_avg['max_temp']):
-        plt.text(x, y + 0.3, f'{y}℃', ha='center', va='bottom', fontsize=10, color=max_line[0].get_color())
+        ax.text(x, y + 0.3, f'{y}℃', ha='center', va='bottom', fontsize=10, color=max_line[0].get_color())
 
     for x, y in zip(monthly_avg['month'], monthly_avg['min_temp']):
-        plt.text(x, y - 0.3, f'{y}℃', ha='center', va='top', fontsize=10, color=min_line[0].get_color())
-
-    # 图表装饰
-    plt.title('大连市2022-2024年月平均气温变化趋势', fontsize=16, pad=20)
-    plt.xlabel('月份', fontsize=14)
-    plt.ylabel('温度(℃)', fontsize=14)
-    plt.xticks(range(1, 13), [f'{m}月' for m in range(1, 13)])
-    plt.ylim(monthly_avg['min_temp'].min() - 2, monthly_avg['max_temp'].max() + 2)  # 调整y轴范围
-
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.legend(fontsize=12)
-
-    # 保存图表
-    plt.tight_layout()
-    plt.savefig('dalian_monthly_temp_trend_with_labels.png', dpi=300)
-    plt.show()
+        ax.text(x, y - 0.3, f'{y}℃', ha='center', va='top', fontsize=10, color=min_line[0].get_color())
+
+    ax.set_ylim(monthly_avg['min_temp'].min() - 2, monthly_avg['max_temp'].max() + 2)  # 调整y轴范围
+
+
+def plot_temperature_trend(monthly_avg, template=None):
+    """绘制温度变化趋势图"""
+    template = template or make_template()
+    path = template.render(lambda ax: draw_temperature_trend(ax, monthly_avg),
+                           '大连市2022-2024年月平均气温变化趋势', 'dalian_monthly_temp_trend_with_labels.png',
+                           legend=dict(fontsize=12),
+                           month_ticks=list(monthly_avg['month']), tick_positions=list(monthly_avg['month']))
+    print(f"图表已保存为 {path}")
 
 
 def main():
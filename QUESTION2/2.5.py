@@ -1,135 +1,194 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from statsmodels.tsa.statespace.sarimax import SARIMAX
-import matplotlib.font_manager as fm
+import argparse
+import time
 import warnings
 
+from weather_agg import AGG_DIR, WeatherAggregates
+from weather_figure import ChartTemplate, set_chinese_font
+from weather_forecast import MODEL_DIR, ORDER, SEASONAL_ORDER, backtest, batch_forecast, min_length, monthly_series
+from weather_store import DATASET_DIR, read_partitions
+
 warnings.filterwarnings("ignore")
 
+# 单序列预测的城市、变量和测试集月数
+CITY = 'dalian'
+VARIABLE = 'max_temp'
+TEST_MONTHS = 6
 
-# 1. 设置中文字体
-def set_chinese_font():
-    try:
-        # 尝试使用系统自带字体
-        font_path = None
-        for font in fm.fontManager.ttflist:
-            if 'SimHei' in font.name:
-                font_path = font.fname
-                break
-
-        if font_path is None:
-            for font in fm.fontManager.ttflist:
-                if 'Microsoft YaHei' in font.name:
-                    font_path = font.fname
-                    break
-
-        if font_path:
-            plt.rcParams['font.sans-serif'] = [fm.FontProperties(fname=font_path).get_name()]
-            plt.rcParams['axes.unicode_minus'] = False
-            print(f"已设置中文字体: {fm.FontProperties(fname=font_path).get_name()}")
-        else:
-            print("警告: 未找到合适的中文字体，图表可能显示异常")
-    except Exception as e:
-        print(f"字体设置出错: {str(e)}")
-
-
-# 2. 生成模拟数据函数
-def generate_sample_data():
-    """生成包含日期和温度的模拟数据"""
-    dates = pd.date_range('2020-01-01', '2025-06-30')
-    temps = 10 + 15 * np.sin(2 * np.pi * (dates.dayofyear / 365)) + np.random.normal(0, 3, len(dates))
-    return pd.DataFrame({'日期': dates, '温度': temps})
-
-
-# 3. 主分析函数
-def analyze_temperature():
-    # 设置中文字体
-    set_chinese_font()
+# 分区数据集的聚合缓存，与 2.2 使用的CSV（AGG_DIR）分开保存
+AGG_ROOT = f'{AGG_DIR}_{DATASET_DIR}'
+
+
+# 1. 读取月平均数据
+def load_monthly_series():
+    """
+    读取爬取的数据集，返回 城市x变量 的月平均序列
+
+    月度聚合由 WeatherAggregates 增量维护，只有新增的日期需要重新计算；
+    天数不完整的月份（如当前月份）不参与建模
+    """
+    df = read_partitions(root=DATASET_DIR)
+    if df.empty:
+        return {}
+    aggregates = WeatherAggregates(AGG_ROOT)
+    aggregates.update(df)
+    return monthly_series(aggregates.rollup('monthly', with_counts=True))
 
-    # 获取数据
-    df = generate_sample_data()
-    df['日期'] = pd.to_datetime(df['日期'])
-    df.set_index('日期', inplace=True)
 
-    # 划分数据集
-    train = df.loc['2020-01-01':'2024-12-31', '温度']
-    test = df.loc['2025-01-01':'2025-06-30', '温度']
+def make_template():
+    """创建预测图模板，可在多个序列间复用"""
+    return ChartTemplate((12, 6), '日期', '温度 (℃)', grid=dict(visible=True, linestyle='--', alpha=0.6),
+                         title_size=14, label_size=12)
 
-    # 转换为月平均
-    train_monthly = train.resample('M').mean()
-    test_monthly = test.resample('M').mean()
 
-    # 设置SARIMA参数
-    order = (1, 0, 1)  # (p,d,q)
-    seasonal_order = (1, 1, 0, 12)  # (P,D,Q,m)
+# 2. 主分析函数
+def analyze_temperature(template=None):
+    # 设置中文字体（字体查找结果有缓存）
+    font = set_chinese_font()
+    print(f"已设置中文字体: {font}" if font else "警告: 未找到合适的中文字体，图表可能显示异常")
+
+    # 获取数据
+    series_map = load_monthly_series()
+    key = f'{CITY}-{VARIABLE}'
+    if key not in series_map:
+        print(f"错误: {DATASET_DIR}/ 中没有 {CITY} 的数据，请先运行任务一代码获取数据")
+        return
+    monthly = series_map[key]
+
+    # 与批量预测和回测相同：训练集至少要有两个完整的季节周期
+    required = min_length(SEASONAL_ORDER) + TEST_MONTHS
+    if monthly.count() < required:
+        print(f"错误: {key} 只有 {monthly.count()} 个完整月份，预测至少需要 {required} 个月"
+              f"（训练 {min_length(SEASONAL_ORDER)} 个月 + 测试 {TEST_MONTHS} 个月）")
+        return
+
+    # 划分数据集：最后 TEST_MONTHS 个月作为测试集
+    train_monthly = monthly.iloc[:-TEST_MONTHS]
+    test_monthly = monthly.iloc[-TEST_MONTHS:]
 
     # 训练模型
     model = SARIMAX(train_monthly,
-                    order=order,
-                    seasonal_order=seasonal_order).fit(disp=False)
+                    order=ORDER,
+                    seasonal_order=SEASONAL_ORDER).fit(disp=False)
 
     # 预测
-    forecast = model.get_forecast(steps=6)
+    forecast = model.get_forecast(steps=len(test_monthly))
     pred = forecast.predicted_mean
     ci = forecast.conf_int()
 
     # 可视化设置
-    plt.figure(figsize=(12, 6))
-    ax = plt.gca()
-
-    # 绘制数据
-    train_line, = ax.plot(train_monthly[-12:].index,
-                          train_monthly[-12:].values,
-                          'o-', label='历史月平均温度')
-
-    test_line, = ax.plot(test_monthly.index,
-                         test_monthly.values,
-                         'o-', color='green', label='真实月平均温度')
-
-    pred_line, = ax.plot(test_monthly.index,
-                         pred.values,
-                         '--x', color='red', label='预测值')
-
-    # 填充置信区间
-    ax.fill_between(test_monthly.index,
-                    ci.iloc[:, 0],
-                    ci.iloc[:, 1],
-                    color='gray', alpha=0.2, label='95%置信区间')
-
-    # 设置标题和标签
-    plt.title('大连市月平均最高温度预测 (2025年1-6月)', fontsize=14, pad=20)
-    plt.xlabel('日期', fontsize=12, labelpad=10)
-    plt.ylabel('温度 (℃)', fontsize=12, labelpad=10)
-
-    # 设置坐标轴格式
-    ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%Y-%m'))
-    plt.xticks(rotation=45)
-    plt.yticks(np.arange(0, 30, 2))
-
-    # 添加坐标值标签
-    for x, y in zip(train_monthly[-12:].index, train_monthly[-12:].values):
-        ax.text(x, y, f'{y:.1f}', ha='center', va='bottom', fontsize=8)
-
-    for x, y in zip(test_monthly.index, test_monthly.values):
-        ax.text(x, y, f'{y:.1f}', ha='center', va='bottom', fontsize=8, color='green')
-
-    for x, y in zip(test_monthly.index, pred.values):
-        ax.text(x, y, f'{y:.1f}', ha='center', va='top', fontsize=8, color='red')
-
-    # 添加网格和图示
-    ax.grid(True, linestyle='--', alpha=0.6)
-    ax.legend(loc='upper left')
-
-    # 调整布局
-    plt.tight_layout()
-
-    # 保存图像
-    plt.savefig('temperature_prediction_with_labels.png', dpi=300, bbox_inches='tight')
-    print("图表已保存为 temperature_prediction_with_labels.png")
-    plt.show()
+    template = template or make_template()
+    history = train_monthly[-12:]
+
+    def draw(ax):
+        # 绘制数据
+        ax.plot(history.index, history.values, 'o-', label='历史月平均温度')
+        ax.plot(test_monthly.index, test_monthly.values, 'o-', color='green', label='真实月平均温度')
+        ax.plot(test_monthly.index, pred.values, '--x', color='red', label='预测值')
+
+        # 填充置信区间
+        ax.fill_between(test_monthly.index,
+                        ci.iloc[:, 0],
+                        ci.iloc[:, 1],
+                        color='gray', alpha=0.2, label='95%置信区间')
+
+        # 设置坐标轴格式
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.set_yticks(np.arange(0, 30, 2))
+
+        # 添加坐标值标签
+        for x, y in zip(history.index, history.values):
+            ax.text(x, y, f'{y:.1f}', ha='center', va='bottom', fontsize=8)
+
+        for x, y in zip(test_monthly.index, test_monthly.values):
+            ax.text(x, y, f'{y:.1f}', ha='center', va='bottom', fontsize=8, color='green')
+
+        for x, y in zip(test_monthly.index, pred.values):
+            ax.text(x, y, f'{y:.1f}', ha='center', va='top', fontsize=8, color='red')
+
+    # 绘制并保存图像
+    period = f"{test_monthly.index[0]:%Y年%m月}-{test_monthly.index[-1]:%Y年%m月}"
+    path = template.render(draw, f'大连市月平均最高温度预测 ({period})', 'temperature_prediction_with_labels.png',
+                           legend=dict(loc='upper left'))
+    print(f"图表已保存为 {path}")
+
+
+# 3. 批量预测
+def forecast_all(steps=6, max_workers=None):
+    """为数据集中每个 城市x变量 的月平均序列并行拟合 SARIMA 并预测"""
+    series_map = load_monthly_series()
+    if not series_map:
+        print(f"错误: {DATASET_DIR}/ 中没有数据，请先运行任务一代码获取数据")
+        return
+
+    print(f"共 {len(series_map)} 个序列，开始批量拟合...")
+    start = time.perf_counter()
+    forecasts, statuses, errors = batch_forecast(series_map, steps=steps, max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+
+    counts = pd.Series(statuses).value_counts()
+    print(f"完成，用时 {elapsed:.1f} 秒（复用 {counts.get('reused', 0)}，"
+          f"热启动 {counts.get('warm', 0)}，冷启动 {counts.get('cold', 0)}，"
+          f"跳过 {counts.get('skipped', 0)}，失败 {counts.get('failed', 0)}），模型保存在 {MODEL_DIR}/")
+    for key, error in errors.items():
+        print(f"  {key} {'跳过' if statuses[key] == 'skipped' else '失败'}: {error}")
+    if not forecasts:
+        print("错误: 没有序列预测成功")
+        return
+
+    result = pd.concat(forecasts, names=['series', 'month']).reset_index()
+    result.to_csv('batch_forecast.csv', index=False, encoding='utf-8-sig')
+    print(result.round(1).to_string(index=False))
+    print("预测结果已保存为 batch_forecast.csv")
+
+
+# 4. 滚动起点回测
+def run_backtest(folds=6, horizon=3, max_workers=None):
+    """在真实数据上做滚动起点回测，输出各预测步长的误差"""
+    series_map = load_monthly_series()
+    key = f'{CITY}-{VARIABLE}'
+    if key not in series_map:
+        print(f"错误: {DATASET_DIR}/ 中没有 {CITY} 的数据，请先运行任务一代码获取数据")
+        return
+
+    print(f"{key}: {folds} 折滚动起点回测，每折预测 {horizon} 个月，"
+          f"SARIMA{ORDER}x{SEASONAL_ORDER}")
+    start = time.perf_counter()
+    try:
+        detail, metrics = backtest(series_map[key], folds, horizon, max_workers=max_workers)
+    except ValueError as e:
+        print(f"错误: {e}")
+        return
+    print(f"完成，用时 {time.perf_counter() - start:.1f} 秒")
+    print(metrics.round(2).to_string())
+
+    detail.to_csv('backtest_detail.csv', index=False, encoding='utf-8-sig')
+    print("逐月预测明细已保存为 backtest_detail.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SARIMA 气温预测')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--batch', action='store_true', help='对数据集中所有 城市x变量 序列并行批量预测')
+    mode.add_argument('--backtest', action='store_true', help='滚动起点回测并输出误差指标')
+    parser.add_argument('--steps', type=int, default=6, help='批量预测的步数（月）')
+    parser.add_argument('--folds', type=int, default=6, help='回测折数')
+    parser.add_argument('--horizon', type=int, default=3, help='回测每折预测的月数')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认为CPU核数')
+    args = parser.parse_args()
+
+    if args.batch:
+        forecast_all(args.steps, args.workers)
+    elif args.backtest:
+        run_backtest(args.folds, args.horizon, args.workers)
+    else:
+        analyze_temperature()
 
 
 if __name__ == "__main__":
-    analyze_temperature()
\ No newline at end of file
+    main()
\ No newline at end of file
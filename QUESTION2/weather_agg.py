@@ -0,0 +1,210 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+AGG_DIR = '.weather_agg'
+
+# 参与聚合的数值列，mean_temp 由最高/最低气温求平均得到
+VALUE_COLUMNS = ['max_temp', 'min_temp', 'mean_temp']
+ROLLING_WINDOWS = [7, 30]
+
+# 气象季节：12-2 月为冬季，12 月计入下一年的冬季
+SEASONS = np.array(['冬', '冬', '春', '春', '春', '夏', '夏', '夏', '秋', '秋', '秋', '冬'])
+
+
+def _week_key(dates):
+    return {'period': dates.dt.to_period('W').dt.start_time}
+
+
+def _month_key(dates):
+    return {'period': dates.dt.to_period('M').dt.start_time}
+
+
+def _season_key(dates):
+    month = dates.dt.month.to_numpy()
+    return {'season_year': dates.dt.year.to_numpy() + (month == 12), 'season': SEASONS[month - 1]}
+
+
+def _climatology_key(dates):
+    return {'month': dates.dt.month.to_numpy()}
+
+
+# 聚合粒度 -> 由日期生成分组键的函数
+GRAINS = {
+    'weekly': _week_key,
+    'monthly': _month_key,
+    'seasonal': _season_key,
+    'climatology': _climatology_key
+}
+
+
+class WeatherAggregates:
+    """
+    按城市维护的天气聚合结果，支持追加新日期后增量更新
+
+    各粒度只保存每组的 和/非空计数，追加数据时把新行的 和/计数 累加进去，
+    均值在读取时由 和/计数 得出；滚动均值只对新行及其之前一个窗口的数据重新计算。
+    全部状态以 Feather 格式保存在 root 目录
+
+    update 时已处理日期及之前的行会与保存的每日数据比对，一致则只累加新日期；
+    历史数据有变化（重新解析、合并更新、补爬缺失月份）时自动从头聚合
+
+    参数:
+        root (str): 缓存目录
+        windows (list): 滚动窗口天数
+    """
+
+    def __init__(self, root=AGG_DIR, windows=ROLLING_WINDOWS):
+        self.root = root
+        self.windows = list(windows)
+        self.daily = None
+        self.sums = {}
+        self._load()
+
+    def _path(self, name):
+        return os.path.join(self.root, name + '.feather')
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.root, 'meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if meta.get('windows') != self.windows:
+            return
+        self.daily = feather.read_feather(self._path('daily'))
+        self.sums = {grain: feather.read_feather(self._path(grain)) for grain in GRAINS}
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        for name, frame in [('daily', self.daily)] + list(self.sums.items()):
+            tmp_path = self._path(name) + '.tmp'
+            feather.write_feather(frame.reset_index(drop=True), tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self._path(name))
+        with open(os.path.join(self.root, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'windows': self.windows}, f)
+
+    def last_dates(self):
+        """各城市已处理的最后日期"""
+        if self.daily is None:
+            return pd.Series(dtype='datetime64[ns]')
+        return self.daily.groupby('city')['date'].max()
+
+    def rebuild(self, df):
+        """丢弃已有状态，从头聚合 df"""
+        self.daily = None
+        self.sums = {}
+        return self.update(df)
+
+    def _matches(self, processed):
+        """processed（按城市和日期排序）是否与已处理的每日数据完全一致"""
+        daily = self.daily
+        if len(processed) != len(daily):
+            return False
+        return ((processed['city'].to_numpy() == daily['city'].to_numpy()).all()
+                and (processed['date'].to_numpy('datetime64[ns]') == daily['date'].to_numpy('datetime64[ns]')).all()
+                and all(np.array_equal(processed[col].to_numpy(), daily[col].to_numpy(), equal_nan=True)
+                        for col in ('max_temp', 'min_temp')))
+
+    def update(self, df):
+        """
+        把 df 中比已处理日期更新的行累加进各粒度聚合结果并保存
+
+        df 中已处理日期及之前的行与保存的状态不一致时，丢弃状态按 df 从头聚合
+
+        参数:
+            df (DataFrame): 含 city、date、max_temp、min_temp 列的每日数据
+
+        返回:
+            int: 新处理的行数
+        """
+        new = df[['city', 'date', 'max_temp', 'min_temp']].copy()
+        new['date'] = pd.to_datetime(new['date'])
+        new = new.drop_duplicates(['city', 'date'], keep='last').sort_values(['city', 'date'], ignore_index=True)
+        new['max_temp'] = new['max_temp'].astype('float64')
+        new['min_temp'] = new['min_temp'].astype('float64')
+        last = self.last_dates()
+        if len(last):
+            processed = new['date'] <= new['city'].map(last)
+            if self._matches(new[processed]):
+                new = new[~processed]
+            else:
+                # 已处理的数据被修改过，增量结果不再可信
+                self.daily = None
+                self.sums = {}
+        if new.empty:
+            return 0
+        new['mean_temp'] = (new['max_temp'] + new['min_temp']) / 2
+
+        # 各粒度只对新行分组一次，再与已有的 和/计数 合并
+        for grain, key_func in GRAINS.items():
+            keys = key_func(new['date'])
+            part = new[['city'] + VALUE_COLUMNS].assign(**keys)
+            key_columns = ['city'] + list(keys)
+            grouped = part.groupby(key_columns)[VALUE_COLUMNS]
+            partial = grouped.sum().add_suffix('_sum').join(grouped.count().add_suffix('_count')).reset_index()
+            if grain in self.sums:
+                partial = pd.concat([self.sums[grain], partial], ignore_index=True)
+                partial = partial.groupby(key_columns, as_index=False).sum()
+            self.sums[grain] = partial
+
+        self.daily = self._append_rolling(new)
+        self._save()
+        return len(new)
+
+    def _append_rolling(self, new):
+        """计算新行的滚动均值，只带上每个城市最近一个窗口的历史数据"""
+        context = new
+        if self.daily is not None:
+            start = new.groupby('city')['date'].min()
+            history = self.daily[['city', 'date'] + VALUE_COLUMNS]
+            earliest = history['city'].map(start) - pd.Timedelta(days=max(self.windows))
+            context = pd.concat([history[history['date'] > earliest], new], ignore_index=True)
+
+        rolled = new.copy()
+        for window in self.windows:
+            means = (context.set_index('date').groupby('city')[VALUE_COLUMNS]
+                     .rolling(f'{window}D', min_periods=1).mean()
+                     .add_suffix(f'_roll{window}').reset_index())
+            rolled = rolled.merge(means, on=['city', 'date'], how='left')
+
+        if self.daily is None:
+            return rolled.reset_index(drop=True)
+        return pd.concat([self.daily, rolled]).sort_values(['city', 'date'], ignore_index=True)
+
+    def rollup(self, grain, with_counts=False):
+        """
+        某粒度的聚合均值
+
+        参数:
+            grain (str): weekly、monthly、seasonal 或 climatology
+            with_counts (bool): 是否同时返回各数值列参与平均的天数（<列名>_count）
+
+        返回:
+            DataFrame: 分组键和各数值列的均值
+        """
+        sums = self.sums[grain]
+        result = sums[[c for c in sums.columns if not c.endswith(('_sum', '_count'))]].copy()
+        for col in VALUE_COLUMNS:
+            count = sums[f'{col}_count'].to_numpy()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[col] = np.where(count > 0, sums[f'{col}_sum'].to_numpy() / count, np.nan)
+            if with_counts:
+                result[f'{col}_count'] = count
+        return result
+
+    def climatology(self):
+        """各城市逐月气候平均值"""
+        return self.rollup('climatology')
+
+    def anomalies(self):
+        """每日数值相对当月气候平均值的距平"""
+        normals = self.climatology()
+        daily = self.daily[['city', 'date'] + VALUE_COLUMNS].assign(month=self.daily['date'].dt.month)
+        merged = daily.merge(normals, on=['city', 'month'], how='left', suffixes=('', '_normal'))
+        for col in VALUE_COLUMNS:
+            merged[f'{col}_anomaly'] = merged[col] - merged[f'{col}_normal']
+        return merged[['city', 'date'] + [f'{col}_anomaly' for col in VALUE_COLUMNS]]
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+ARCHIVE_DIR = 'weather_archive'
+
+
+class RawArchive:
+    """
+    原始页面归档，按内容哈希去重存储，按 城市/年/月 建立索引
+
+    目录结构:
+        <root>/objects/<哈希前2位>/<哈希>.html.gz: gzip 压缩的原始响应体
+        <root>/index.json: "城市/年/月" -> {sha256, encoding, fetched_at}
+        <root>/index.log: 追加写入的索引变更，每行一条 JSON，加载时合并进 index.json
+
+    参数:
+        root (str): 归档目录
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.index_file = os.path.join(root, 'index.json')
+        self.log_file = os.path.join(root, 'index.log')
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        try:
+            with open(self.index_file, encoding='utf-8') as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+        if self._replay_log():
+            self.compact()
+
+    @staticmethod
+    def key(city, year, month):
+        return f'{city}/{year}/{month:02d}'
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest + '.html.gz')
+
+    def put(self, city, year, month, content, encoding):
+        """
+        归档一次响应，相同内容只存一份
+
+        参数:
+            content (bytes): 原始响应体
+            encoding (str): 页面编码
+
+        返回:
+            str: 内容的 sha256
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        key = self.key(city, year, month)
+        entry = {'sha256': digest, 'encoding': encoding, 'fetched_at': time.time()}
+        # 只追加一行日志，写入量与页面数成线性关系
+        line = json.dumps({'key': key, **entry}, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.index[key] = entry
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+        return digest
+
+    def _replay_log(self):
+        """把 index.log 中的变更应用到内存索引，返回应用的条数"""
+        try:
+            with open(self.log_file, encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+        count = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:  # 中断时写了一半的最后一行
+                continue
+            self.index[entry.pop('key')] = entry
+            count += 1
+        return count
+
+    def compact(self):
+        """把内存索引写回 index.json 并清空 index.log，每次爬取结束时调用一次"""
+        with self.lock:
+            tmp_path = self.index_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=0, sort_keys=True)
+            os.replace(tmp_path, self.index_file)
+            if os.path.exists(self.log_file):
+                os.remove(self.log_file)
+
+    def get(self, city, year, month):
+        """读取归档页面并按原编码解码，不存在时返回 None"""
+        entry = self.index.get(self.key(city, year, month))
+        if entry is None:
+            return None
+        with gzip.open(self._object_path(entry['sha256']), 'rb') as f:
+            return f.read().decode(entry['encoding'], errors='replace')
+
+    def entries(self, cities=None, years=None):
+        """
+        列出已归档的 (城市, 年, 月)
+
+        参数:
+            cities (list): 只列出这些城市，None 表示全部
+            years (list): 只列出这些年份，None 表示全部
+        """
+        result = []
+        for key in sorted(self.index):
+            city, year, month = key.split('/')
+            year, month = int(year), int(month)
+            if (cities is None or city in cities) and (years is None or year in years):
+                result.append((city, year, month))
+        return result
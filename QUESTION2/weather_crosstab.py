@@ -0,0 +1,98 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from weather_data import CACHE_DIR
+
+# (数据集版本, 行列, 列列, 行指纹) -> 计数矩阵
+_MEMO = {}
+
+
+def count_matrix(rows, cols):
+    """
+    用一次 bincount 统计两个分类列的联合频数
+
+    两列先编码为整数，再把 (行编码, 列编码) 合成一个下标计数；缺失值不计入
+
+    参数:
+        rows (Series): 行分类列，例如 month
+        cols (Series): 列分类列，例如 day_wind_level
+
+    返回:
+        DataFrame: 行、列均按取值排序的计数矩阵
+    """
+    row_codes, row_values = pd.factorize(rows, sort=True)
+    col_codes, col_values = pd.factorize(cols, sort=True)
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    flat = row_codes[valid] * len(col_values) + col_codes[valid]
+    counts = np.bincount(flat, minlength=len(row_values) * len(col_values))
+    return pd.DataFrame(counts.reshape(len(row_values), len(col_values)),
+                        index=pd.Index(row_values, name=rows.name),
+                        columns=pd.Index(col_values, name=cols.name))
+
+
+def _to_long(matrix):
+    """计数矩阵转为 (row, col, count) 长表，行列标签保持原类型，不受 Feather 列名必须是字符串的限制"""
+    return pd.DataFrame({
+        'row': np.repeat(matrix.index.to_numpy(), len(matrix.columns)),
+        'col': np.tile(matrix.columns.to_numpy(), len(matrix.index)),
+        'count': matrix.to_numpy().ravel()
+    })
+
+
+def _from_long(long, row, col):
+    """_to_long 的逆过程"""
+    index = pd.Index(pd.unique(long['row']), name=row)
+    columns = pd.Index(pd.unique(long['col']), name=col)
+    return pd.DataFrame(long['count'].to_numpy().reshape(len(index), len(columns)), index=index, columns=columns)
+
+
+def frame_fingerprint(df):
+    """
+    df 所含行的指纹：行数和行索引的哈希
+
+    pandas 会把 attrs 复制到筛选出的子表上，只凭数据集版本无法区分全表和按城市、年份筛选的子表；
+    数据集版本已确定各行的取值，行索引确定取了哪些行。只哈希索引，比重新统计快得多
+    """
+    digest = hashlib.sha256(str(len(df)).encode())
+    digest.update(pd.util.hash_pandas_object(df.index, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def crosstab(df, row, col, cache_dir=CACHE_DIR):
+    """
+    行 x 列 计数矩阵，按数据集版本在内存和磁盘上缓存
+
+    数据集版本取自 df.attrs['version']（由 weather_data.load_weather 设置），
+    没有版本时每次重新计算。缓存键还包含 frame_fingerprint，按城市、年份等筛选出的子表
+    各自统计。磁盘上以长表保存，读回的行列标签和类型与直接计算一致
+
+    参数:
+        df (DataFrame): 天气数据
+        row (str): 行分类列名
+        col (str): 列分类列名
+        cache_dir (str): 磁盘缓存目录
+
+    返回:
+        DataFrame: 计数矩阵
+    """
+    version = df.attrs.get('version')
+    if version is None:
+        return count_matrix(df[row], df[col])
+
+    fingerprint = frame_fingerprint(df)
+    key = (version, row, col, fingerprint)
+    if key not in _MEMO:
+        path = os.path.join(cache_dir, 'crosstab', f'{version}-{row}-{col}-{fingerprint}.long.feather')
+        if os.path.exists(path):
+            _MEMO[key] = _from_long(feather.read_feather(path), row, col)
+        else:
+            _MEMO[key] = count_matrix(df[row], df[col])
+            # 空矩阵无法从长表还原行列，不写入磁盘
+            if _MEMO[key].size:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                feather.write_feather(_to_long(_MEMO[key]), path, compression='uncompressed')
+    return _MEMO[key].copy()
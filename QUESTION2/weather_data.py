@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+SOURCE_FILE = 'dalian_weather_2022_2024.csv'
+CACHE_DIR = '.weather_cache'
+
+# 缓存格式版本，enrich 的输出列变化时加 1 使旧缓存失效
+CACHE_VERSION = 1
+
+
+# 分类规则表: 按顺序匹配，取第一个包含任一关键字的类别
+WIND_RULES = [
+    ('1-2级', ['1-2级']),
+    ('3-4级', ['3-4级']),
+    ('5-6级', ['5-6级']),
+    ('7-8级', ['7-8级']),
+    ('9-10级', ['9-10级'])
+]
+WEATHER_RULES = [
+    ('晴天', ['晴']),
+    ('多云', ['云', '昙']),
+    ('阴天', ['阴']),
+    ('雨天', ['雨']),
+    ('雪天', ['雪']),
+    ('雾/霾', ['雾', '霾'])
+]
+OTHER = '其他'
+UNKNOWN = '未知'
+
+
+def classify(value, rules, default=OTHER):
+    """按规则表对单个字符串分类，非字符串返回 UNKNOWN"""
+    if not isinstance(value, str):
+        return UNKNOWN
+    for label, keywords in rules:
+        if any(keyword in value for keyword in keywords):
+            return label
+    return default
+
+
+def classify_series(series, rules, default=OTHER):
+    """
+    向量化分类：先对取值去重编码，只对每个不同取值匹配一次规则，再按编码广播回每一行
+
+    参数:
+        series (Series): 待分类的字符串列
+        rules (list): (类别, 关键字列表) 规则表
+        default (str): 没有规则命中时的类别
+
+    返回:
+        Series: 与输入等长的类别列
+    """
+    codes, uniques = pd.factorize(series)
+    # 缺失值编码为 -1，正好取到末尾的 UNKNOWN
+    table = np.array([classify(value, rules, default) for value in uniques] + [UNKNOWN], dtype=object)
+    return pd.Series(table[codes], index=series.index, name=series.name)
+
+
+def classify_wind(wind_str):
+    """风力等级分类"""
+    return classify(wind_str, WIND_RULES)
+
+
+def classify_weather(weather):
+    """天气状况分类"""
+    return classify(weather, WEATHER_RULES)
+
+
+def enrich(df, wind_rules=WIND_RULES, weather_rules=WEATHER_RULES):
+    """添加月份、风力等级和天气状况分类列"""
+    df['month'] = df['date'].dt.month
+    df['day_wind_level'] = classify_series(df['day_wind'], wind_rules)
+    df['night_wind_level'] = classify_series(df['night_wind'], wind_rules)
+    df['day_weather_type'] = classify_series(df['day_weather'], weather_rules)
+    df['night_weather_type'] = classify_series(df['night_weather'], weather_rules)
+    return df
+
+
+def rules_digest(*rule_tables):
+    """规则表的摘要，规则变化时使缓存失效"""
+    return hashlib.sha256(json.dumps(rule_tables, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+def file_sha256(path):
+    """分块计算文件的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(source, cache_dir):
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, name + '.feather'), os.path.join(cache_dir, name + '.json')
+
+
+def load_weather(source=SOURCE_FILE, cache_dir=CACHE_DIR, wind_rules=WIND_RULES, weather_rules=WEATHER_RULES):
+    """
+    加载解析并分类后的天气数据，结果以 Feather 格式缓存在磁盘上
+
+    源文件的 mtime 和大小未变时直接读缓存；mtime 变化但内容 sha256 相同
+    （例如被重新拷贝）时只更新缓存元数据；否则重新解析并写入缓存
+
+    参数:
+        source (str): 任务一生成的 CSV 文件
+        cache_dir (str): 缓存目录
+        wind_rules (list): 风力等级规则表
+        weather_rules (list): 天气状况规则表
+
+    返回:
+        DataFrame: 带 month 和各分类列的天气数据，df.attrs['version'] 为数据集版本
+
+    异常:
+        FileNotFoundError: 源文件不存在
+    """
+    stat = os.stat(source)
+    table_path, meta_path = _cache_paths(source, cache_dir)
+    meta = {'version': CACHE_VERSION, 'rules': rules_digest(wind_rules, weather_rules),
+            'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (FileNotFoundError, ValueError):
+        cached = {}
+
+    fresh = os.path.exists(table_path) and all(cached.get(k) == meta[k] for k in ('version', 'rules'))
+    if fresh and (cached.get('mtime_ns'), cached.get('size')) != (meta['mtime_ns'], meta['size']):
+        meta['sha256'] = file_sha256(source)
+        fresh = cached.get('sha256') == meta['sha256']
+        if fresh:
+            _write_meta(meta_path, meta)
+    if fresh:
+        df = feather.read_table(table_path, memory_map=True).to_pandas()
+        df.attrs['version'] = f"{cached['sha256'][:16]}-{meta['rules']}"
+        return df
+
+    df = enrich(pd.read_csv(source, parse_dates=['date']), wind_rules, weather_rules)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = table_path + '.tmp'
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, table_path)
+    meta['sha256'] = meta.get('sha256') or file_sha256(source)
+    _write_meta(meta_path, meta)
+    df.attrs['version'] = f"{meta['sha256'][:16]}-{meta['rules']}"
+    return df
+
+
+def _write_meta(path, meta):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,125 @@
+import functools
+import json
+import os
+
+import matplotlib
+from matplotlib import font_manager as fm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from weather_data import CACHE_DIR
+
+# 按顺序查找的中文字体
+FONT_CANDIDATES = ['SimHei', 'Microsoft YaHei', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei']
+FONT_CACHE = os.path.join(CACHE_DIR, 'font.json')
+
+MONTH_LABELS = [f'{m}月' for m in range(1, 13)]
+
+
+@functools.lru_cache(maxsize=None)
+def find_chinese_font(cache_file=FONT_CACHE):
+    """
+    查找可用的中文字体，结果缓存在内存和 cache_file 中
+
+    返回:
+        str: 字体名称，找不到时返回 None
+    """
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            cached = json.load(f)
+        if os.path.exists(cached['path']):
+            return cached['name']
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    fonts = {font.name: font.fname for font in fm.fontManager.ttflist}
+    for name in FONT_CANDIDATES:
+        if name in fonts:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'name': name, 'path': fonts[name]}, f, ensure_ascii=False)
+            return name
+    return None
+
+
+def set_chinese_font():
+    """设置中文字体和负号显示，返回使用的字体名称"""
+    name = find_chinese_font()
+    matplotlib.rcParams['font.sans-serif'] = [name or 'SimHei']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return name
+
+
+class ChartTemplate:
+    """
+    预先设置好样式的图表模板，不经过 pyplot，可在无显示环境下批量渲染
+
+    画布、坐标轴标签、网格和刻度样式只设置一次；每次 render 只移除上一次的
+    数据图元（折线、柱、文字、图例），再由 draw 回调画入新数据并保存
+
+    参数:
+        figsize (tuple): 画布尺寸（英寸）
+        xlabel (str): x 轴标签
+        ylabel (str): y 轴标签
+        grid (dict): ax.grid 的参数
+        dpi (int): 保存分辨率
+        title_size (int): 标题字号
+        label_size (int): 坐标轴标签字号
+    """
+
+    def __init__(self, figsize, xlabel, ylabel, grid=None, dpi=300, title_size=16, label_size=14):
+        set_chinese_font()
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.grid = grid or {}
+        self.dpi = dpi
+        self.title_size = title_size
+        self.label_size = label_size
+        self._style()
+
+    def _style(self):
+        self.ax.set_xlabel(self.xlabel, fontsize=self.label_size)
+        self.ax.set_ylabel(self.ylabel, fontsize=self.label_size)
+        if self.grid:
+            self.ax.grid(**self.grid)
+
+    def clear(self):
+        """移除数据图元，保留样式"""
+        ax = self.ax
+        for artist in list(ax.lines) + list(ax.patches) + list(ax.collections) + list(ax.texts):
+            artist.remove()
+        ax.containers.clear()
+        ax.set_prop_cycle(None)
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+        ax.relim()
+        ax.autoscale()
+
+    def render(self, draw, title, path, legend=None, month_ticks=None, tick_positions=None):
+        """
+        画入新数据并保存
+
+        参数:
+            draw (callable): draw(ax)，在坐标轴上画数据
+            title (str): 图表标题
+            path (str): 保存路径
+            legend (dict): ax.legend 的参数，None 表示不画图例
+            month_ticks (list): x 轴各刻度对应的月份（1-12），None 表示保持 draw 设置的刻度
+            tick_positions (list): 月份刻度的 x 坐标，默认为 0..n-1（柱状图）
+        """
+        self.clear()
+        draw(self.ax)
+        # pandas 绘图会改写轴标签，重新应用模板样式
+        self._style()
+        self.ax.set_title(title, fontsize=self.title_size, pad=20)
+        if month_ticks is not None:
+            positions = range(len(month_ticks)) if tick_positions is None else tick_positions
+            self.ax.set_xticks(positions, [MONTH_LABELS[m - 1] for m in month_ticks], rotation=0)
+        if legend is not None:
+            self.ax.legend(**legend)
+        self.figure.tight_layout()
+        self.figure.savefig(path, dpi=self.dpi)
+        return path
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResults
+
+MODEL_DIR = '.sarima_models'
+
+# 默认 SARIMA 参数，与 2.5.py 单序列预测一致
+ORDER = (1, 0, 1)  # (p,d,q)
+SEASONAL_ORDER = (1, 1, 0, 12)  # (P,D,Q,m)
+
+# 月度序列中一个月至少要有这一比例的天数有数据，否则视为缺失
+MIN_COVERAGE = 0.8
+
+
+def min_length(seasonal_order=SEASONAL_ORDER):
+    """拟合季节性模型至少需要的月数：两个完整的季节周期"""
+    return 2 * seasonal_order[3]
+
+
+def series_digest(series, order, seasonal_order):
+    """序列内容和模型参数的摘要，相同时可直接复用已保存的模型"""
+    digest = hashlib.sha256()
+    digest.update(series.index.asi8.tobytes())
+    digest.update(series.to_numpy(dtype='float64').tobytes())
+    digest.update(repr((order, seasonal_order)).encode())
+    return digest.hexdigest()
+
+
+def _model_paths(model_dir, key):
+    return os.path.join(model_dir, key + '.pkl'), os.path.join(model_dir, key + '.json')
+
+
+def fit_series(key, series, steps=6, order=ORDER, seasonal_order=SEASONAL_ORDER, model_dir=MODEL_DIR):
+    """
+    拟合单个序列并预测，供进程池调用
+
+    序列和参数都没变时直接加载已保存的模型；否则以上次拟合的参数为初值重新拟合，
+    拟合结果和参数写回 model_dir。拟合失败时不抛出异常，返回 'failed' 状态和错误信息，
+    以免一个序列的失败中断整个批次
+
+    参数:
+        key (str): 序列标识，用作模型文件名，例如 "dalian-max_temp"
+        series (Series): 月度序列，索引为 DatetimeIndex
+        steps (int): 预测步数
+
+    返回:
+        tuple: (key, 预测 DataFrame[mean, lower, upper]（失败时为 None）, 状态 'reused'/'warm'/'cold'/'failed',
+                错误信息（成功时为 None）)
+    """
+    warnings.filterwarnings("ignore")
+    try:
+        frame, status = _fit_and_forecast(key, series, steps, order, seasonal_order, model_dir)
+    except Exception as e:
+        return key, None, 'failed', f'{type(e).__name__}: {e}'
+    return key, frame, status, None
+
+
+def _fit_and_forecast(key, series, steps, order, seasonal_order, model_dir):
+    model_path, meta_path = _model_paths(model_dir, key)
+    digest = series_digest(series, order, seasonal_order)
+
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        meta = {}
+
+    if meta.get('digest') == digest and os.path.exists(model_path):
+        results = SARIMAXResults.load(model_path)
+        status = 'reused'
+    else:
+        model = SARIMAX(series, order=order, seasonal_order=seasonal_order)
+        start_params = meta.get('params')
+        if start_params is not None and len(start_params) != len(model.start_params):
+            start_params = None
+        results = model.fit(start_params=start_params, disp=False)
+        status = 'cold' if start_params is None else 'warm'
+
+        os.makedirs(model_dir, exist_ok=True)
+        results.save(model_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'digest': digest, 'params': np.asarray(results.params).tolist()}, f)
+
+    forecast = results.get_forecast(steps=steps)
+    ci = forecast.conf_int()
+    frame = pd.DataFrame({
+        'mean': forecast.predicted_mean,
+        'lower': ci.iloc[:, 0],
+        'upper': ci.iloc[:, 1]
+    })
+    return frame, status
+
+
+def batch_forecast(series_map, steps=6, max_workers=None, order=ORDER, seasonal_order=SEASONAL_ORDER,
+                   model_dir=MODEL_DIR):
+    """
+    在进程池中为多个序列分别拟合 SARIMA 并预测
+
+    有效月数不足 min_length(seasonal_order) 的序列不提交拟合，状态记为 'skipped'；
+    拟合失败的序列状态为 'failed'，其余序列照常完成
+
+    参数:
+        series_map (dict): key -> 月度 Series
+        steps (int): 预测步数
+        max_workers (int): 进程数，None 表示 CPU 核数
+
+    返回:
+        tuple: (key -> 预测 DataFrame（只含成功的序列）, key -> 状态, key -> 错误信息（只含跳过和失败的序列）)
+    """
+    forecasts = {}
+    statuses = {}
+    errors = {}
+    required = min_length(seasonal_order)
+    keys = []
+    for key in sorted(series_map):
+        months = series_map[key].count()
+        if months < required:
+            statuses[key] = 'skipped'
+            errors[key] = f'只有 {months} 个月的数据，至少需要 {required} 个月'
+        else:
+            keys.append(key)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fit_series, key, series_map[key], steps, order, seasonal_order, model_dir)
+                   for key in keys]
+        for future in futures:
+            key, frame, status, error = future.result()
+            statuses[key] = status
+            if frame is not None:
+                forecasts[key] = frame
+            else:
+                errors[key] = error
+    return forecasts, statuses, errors
+
+
+def monthly_series(monthly, variables=('max_temp', 'min_temp'), min_coverage=MIN_COVERAGE):
+    """
+    把月度聚合结果拆成 城市x变量 的月平均序列
+
+    monthly 带有 <变量>_count 列时，有数据的天数不足当月天数 min_coverage 的月份
+    （例如刚开始的当月）视为缺失：首尾的这类月份被去掉，中间的记为 NaN，由 SARIMAX 按缺失值处理；
+    没有一个月满足要求的序列为空
+
+    参数:
+        monthly (DataFrame): WeatherAggregates.rollup('monthly', with_counts=True) 的结果，
+            含 city、period 和各变量列
+        min_coverage (float): 月份保留所需的最低天数比例
+
+    返回:
+        dict: "城市-变量" -> 月度 Series（索引为月初日期）
+    """
+    series_map = {}
+    for city, frame in monthly.groupby('city'):
+        frame = frame.set_index('period').sort_index().asfreq('MS')
+        for variable in variables:
+            series = frame[variable].astype('float64')
+            count_col = f'{variable}_count'
+            if count_col in frame:
+                series = series.where(frame[count_col] >= min_coverage * frame.index.days_in_month)
+                if series.first_valid_index() is None:
+                    series = series.iloc[:0]
+                else:
+                    series = series.loc[series.first_valid_index():series.last_valid_index()]
+            series_map[f'{city}-{variable}'] = series
+    return series_map
+
+
+def _backtest_fold(series, origin, horizon, order, seasonal_order):
+    """在 origin 之前的数据上拟合，预测其后 horizon 个月，供进程池调用"""
+    warnings.filterwarnings("ignore")
+    train = series.iloc[:origin]
+    test = series.iloc[origin:origin + horizon]
+    results = SARIMAX(train, order=order, seasonal_order=seasonal_order).fit(disp=False)
+    pred = results.get_forecast(steps=len(test)).predicted_mean.to_numpy()
+    return pd.DataFrame({
+        'origin': test.index[0],
+        'step': np.arange(1, len(test) + 1),
+        'month': test.index,
+        'actual': test.to_numpy(),
+        'pred': pred
+    })
+
+
+def backtest(series, folds=6, horizon=3, order=ORDER, seasonal_order=SEASONAL_ORDER, max_workers=None):
+    """
+    滚动起点回测：依次以最后 folds 个起点切分训练集，各折在进程池中并行拟合
+
+    参数:
+        series (Series): 月度序列
+        folds (int): 折数，最后一折的起点为 len(series) - horizon
+        horizon (int): 每折预测的月数
+
+    返回:
+        tuple: (逐月预测明细 DataFrame, 按预测步长汇总的 MAE/RMSE/偏差 DataFrame)
+
+    异常:
+        ValueError: 序列太短，连一折的训练集都不足 min_length(seasonal_order) 个月
+    """
+    required = min_length(seasonal_order)
+    if len(series) < required + horizon:
+        raise ValueError(f"序列只有 {len(series)} 个月，回测至少需要 {required + horizon} 个月"
+                         f"（训练 {required} 个月 + 预测 {horizon} 个月）")
+    last = len(series) - horizon
+    # 训练集不足 required 个月的起点跳过
+    origins = [origin for origin in range(last - folds + 1, last + 1) if origin >= required]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_backtest_fold, series, origin, horizon, order, seasonal_order)
+                   for origin in origins]
+        detail = pd.concat([future.result() for future in futures], ignore_index=True)
+
+    error = detail['pred'] - detail['actual']
+    metrics = detail.assign(abs_error=error.abs(), sq_error=error ** 2, error=error).groupby('step').agg(
+        MAE=('abs_error', 'mean'), RMSE=('sq_error', 'mean'), bias=('error', 'mean'))
+    metrics['RMSE'] = np.sqrt(metrics['RMSE'])
+    metrics.loc['全部'] = [error.abs().mean(), np.sqrt((error ** 2).mean()), error.mean()]
+    return detail, metrics
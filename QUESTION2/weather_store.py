@@ -0,0 +1,107 @@
+import glob
+import os
+
+import pandas as pd
+
+DATASET_DIR = 'weather_dataset'
+
+
+def partition_path(root, city, year):
+    """某城市某年分区的文件路径"""
+    return os.path.join(root, f'city={city}', f'year={year}', 'part-0.parquet')
+
+
+def write_partitions(df, root=DATASET_DIR):
+    """
+    按 城市/年份 分区写入 Parquet 数据集，已存在的分区整体覆盖
+
+    参数:
+        df (DataFrame): 包含 city 和 date 列的天气数据
+        root (str): 数据集根目录
+
+    返回:
+        list: 写入的分区文件路径
+    """
+    years = pd.to_datetime(df['date']).dt.year
+    paths = []
+    for (city, year), part in df.groupby([df['city'], years]):
+        path = partition_path(root, city, year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part.drop(columns=['city']).sort_values('date').to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def list_partitions(root=DATASET_DIR):
+    """列出数据集中已有的 (城市, 年份) 分区"""
+    partitions = []
+    for path in glob.glob(os.path.join(root, 'city=*', 'year=*', 'part-0.parquet')):
+        year_dir = os.path.dirname(path)
+        city = os.path.basename(os.path.dirname(year_dir))[len('city='):]
+        year = int(os.path.basename(year_dir)[len('year='):])
+        partitions.append((city, year))
+    return sorted(partitions)
+
+
+def read_partitions(cities=None, years=None, root=DATASET_DIR, columns=None):
+    """
+    只读取需要的 城市/年份 分区
+
+    参数:
+        cities (list): 城市拼音列表，None 表示全部
+        years (list): 年份列表，None 表示全部
+        root (str): 数据集根目录
+        columns (list): 需要读取的列，None 表示全部
+
+    返回:
+        DataFrame: 带 city 列、按城市和日期排序的天气数据
+    """
+    frames = []
+    for city, year in list_partitions(root):
+        if (cities is not None and city not in cities) or (years is not None and year not in years):
+            continue
+        part = pd.read_parquet(partition_path(root, city, year), columns=columns)
+        part.insert(0, 'city', city)
+        frames.append(part)
+
+    if not frames:
+        return pd.DataFrame(columns=['city'] + (columns or []))
+    return pd.concat(frames, ignore_index=True)
+
+
+def last_date(city, root=DATASET_DIR):
+    """某城市已存储数据的最后日期，没有数据时返回 None"""
+    years = [year for c, year in list_partitions(root) if c == city]
+    if not years:
+        return None
+    dates = read_partitions([city], [max(years)], root, columns=['date'])['date']
+    return pd.to_datetime(dates).max() if len(dates) else None
+
+
+def upsert_partitions(new_df, root=DATASET_DIR):
+    """
+    以 (city, date) 为键把新数据合并进数据集，同一天的记录以新数据为准
+
+    只读取并重写新数据涉及的 城市/年份 分区，重复执行结果不变
+
+    参数:
+        new_df (DataFrame): 包含 city 和 date 列的新数据
+
+    返回:
+        list: 重写的分区文件路径
+    """
+    new_df = new_df.copy()
+    new_df['date'] = pd.to_datetime(new_df['date'])
+    touched = set(zip(new_df['city'], new_df['date'].dt.year))
+
+    frames = [new_df]
+    for city, year in touched:
+        path = partition_path(root, city, year)
+        if os.path.exists(path):
+            old = pd.read_parquet(path)
+            old.insert(0, 'city', city)
+            frames.insert(0, old)
+
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates(subset=['city', 'date'], keep='last').sort_values(['city', 'date'])
+    return write_partitions(merged, root)
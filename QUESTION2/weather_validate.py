@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+# 违规处理方式：只报告、删除整行、将相关字段置空
+REPORT = 'report'
+DROP = 'drop'
+NULL = 'null'
+
+
+class Rule:
+    """
+    列式校验规则基类
+
+    子类实现 check(df)，返回标记违规行的布尔数组；apply 按 action 处理违规行
+
+    参数:
+        name (str): 规则名称，用于报告
+        columns (list): 规则涉及的列，action 为 NULL 时置空这些列
+        action (str): REPORT、DROP 或 NULL
+    """
+
+    def __init__(self, name, columns, action=REPORT):
+        self.name = name
+        self.columns = list(columns)
+        self.action = action
+
+    def check(self, df):
+        raise NotImplementedError
+
+    def apply(self, df, mask):
+        if self.action == DROP:
+            return df[~mask]
+        if self.action == NULL:
+            df = df.copy()
+            df.loc[mask, self.columns] = np.nan
+        return df
+
+
+class RequiredRule(Rule):
+    """必填字段不能为空值或空字符串"""
+
+    def __init__(self, columns, action=DROP):
+        super().__init__(f"必填: {'/'.join(columns)}", columns, action)
+
+    def check(self, df):
+        mask = np.zeros(len(df), dtype=bool)
+        for col in self.columns:
+            values = df[col]
+            mask |= values.isna().to_numpy()
+            if values.dtype == object or pd.api.types.is_string_dtype(values):
+                mask |= (values.astype(str).str.strip() == '').to_numpy()
+        return mask
+
+
+class RangeRule(Rule):
+    """数值必须落在 [low, high] 内，缺失值不算违规"""
+
+    def __init__(self, column, low, high, action=NULL):
+        super().__init__(f"范围: {column} ∈ [{low}, {high}]", [column], action)
+        self.low = low
+        self.high = high
+
+    def check(self, df):
+        values = pd.to_numeric(df[self.columns[0]], errors='coerce').to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore'):
+            return (values < self.low) | (values > self.high)
+
+
+class DuplicateRule(Rule):
+    """同一键只能出现一次，保留最后一条"""
+
+    def __init__(self, keys, action=DROP):
+        super().__init__(f"重复: {'/'.join(keys)}", keys, action)
+
+    def check(self, df):
+        return df.duplicated(subset=self.columns, keep='last').to_numpy()
+
+
+class InversionRule(Rule):
+    """high 列不能小于 low 列，例如最高气温低于最低气温"""
+
+    def __init__(self, high, low, action=REPORT):
+        super().__init__(f"倒置: {high} < {low}", [high, low], action)
+
+    def check(self, df):
+        high = pd.to_numeric(df[self.columns[0]], errors='coerce').to_numpy(dtype='float64')
+        low = pd.to_numeric(df[self.columns[1]], errors='coerce').to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore'):
+            return high < low
+
+
+def find_gaps(df, date_col='date', by='city'):
+    """
+    找出每组日历上缺失的日期区间
+
+    返回:
+        DataFrame: by、缺失起始日期、缺失结束日期、缺失天数
+    """
+    ordered = df[[by, date_col]].dropna().drop_duplicates().sort_values([by, date_col])
+    dates = ordered[date_col].to_numpy()
+    groups = ordered[by].to_numpy()
+    if len(dates) < 2:
+        return pd.DataFrame(columns=[by, '缺失起始', '缺失结束', '缺失天数'])
+
+    step = (dates[1:] - dates[:-1]) // np.timedelta64(1, 'D')
+    gap = (step > 1) & (groups[1:] == groups[:-1])
+    return pd.DataFrame({
+        by: groups[1:][gap],
+        '缺失起始': dates[:-1][gap] + np.timedelta64(1, 'D'),
+        '缺失结束': dates[1:][gap] - np.timedelta64(1, 'D'),
+        '缺失天数': step[gap] - 1
+    })
+
+
+DEFAULT_RULES = [
+    RequiredRule(['date', 'day_weather']),
+    RangeRule('max_temp', -50, 50),
+    RangeRule('min_temp', -50, 50),
+    DuplicateRule(['city', 'date']),
+    InversionRule('max_temp', 'min_temp')
+]
+
+
+def validate_frame(df, rules=DEFAULT_RULES, date_col='date', by='city'):
+    """
+    按规则依次对整表做向量化校验和清理，并生成违规报告和日历缺口报告
+
+    参数:
+        df (DataFrame): 天气数据，date 列应已转换为 datetime
+        rules (list): Rule 列表，按顺序执行
+        date_col (str): 日期列，用于缺口检查
+        by (str): 分组列，用于缺口检查
+
+    返回:
+        tuple: (清理后的 DataFrame, 各规则违规统计 DataFrame, 日历缺口 DataFrame)
+    """
+    report = []
+    for rule in rules:
+        mask = rule.check(df)
+        report.append({'规则': rule.name, '处理': rule.action, '违规行数': int(mask.sum())})
+        if mask.any():
+            df = rule.apply(df, mask)
+    return df, pd.DataFrame(report), find_gaps(df, date_col, by)
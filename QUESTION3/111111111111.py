@@ -1,4 +1,3 @@
-import requests
 import pandas as pd
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
@@ -6,9 +5,14 @@ from collections import Counter
 from sklearn.linear_model import LinearRegression
 import matplotlib
 import numpy as np
+import argparse
 import os
 import time
 
+from dblp_dump import load_dump
+from dblp_fetch import harvest
+from dblp_store import STORE_FILE, PaperStore
+
 # 设置matplotlib支持中文
 matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False
@@ -25,86 +29,35 @@ START_YEAR = 2020
 END_YEAR = 2024  # 不包含2025年
 
 
-def parse_authors(authors):
-    """解析作者信息，处理不同格式"""
-    if isinstance(authors, dict):
-        author = authors.get('author', [])
-        if isinstance(author, list):
-            names = []
-            for a in author:
-                if isinstance(a, dict):
-                    names.append(a.get('text', ''))
-                else:
-                    names.append(str(a))
-            return ', '.join(names)
-        elif isinstance(author, dict):
-            return author.get('text', '')
-        else:
-            return str(author)
-    elif isinstance(authors, list):
-        return ', '.join([a.get('text', '') if isinstance(a, dict) else str(a) for a in authors])
-    else:
-        return str(authors)
+def report_failures(failures):
+    """打印重试后仍失败的页面，这些年份的数据不完整"""
+    for f in failures:
+        print(f"{f.conference} {f.year} 年 offset={f.offset} 获取失败: {f.error}")
 
 
-def fetch_dblp_api_with_pagination(conf_key, conf_name):
-    """从DBLP API爬取会议论文数据，使用分页获取更多数据"""
-    papers = []
-    for year in range(START_YEAR, END_YEAR + 1):
-        year_papers = []
-        offset = 0
-        max_results = 1000
-
-        while True:
-            url = f"https://dblp.org/search/publ/api?q=stream%3Aconf%2F{conf_key}%3A{year}%3A&h={max_results}&f={offset}&format=json"
-            try:
-                resp = requests.get(url, timeout=15)
-                data = resp.json()
-                hits = data.get('result', {}).get('hits', {}).get('hit', [])
-
-                if not hits:
-                    break
-
-                for hit in hits:
-                    info = hit.get('info', {})
-                    title = info.get('title', '')
-                    authors = parse_authors(info.get('authors', {}))
-                    link = info.get('url', '')
-
-                    if title:  # 只保存有标题的论文
-                        year_papers.append({
-                            "title": title,
-                            "authors": authors,
-                            "year": year,
-                            "conference": conf_name,
-                            "link": link
-                        })
-
-                # 如果返回的结果少于请求的数量，说明已经获取完所有数据
-                if len(hits) < max_results:
-                    break
-
-                offset += max_results
-                time.sleep(0.5)  # 避免请求过快
-
-            except Exception as e:
-                print(f"{conf_name} {year} 年获取失败: {e}")
-                break
-
-        papers.extend(year_papers)
-        print(f"{conf_name} {year} 年论文数：{len(year_papers)}")
-
-    return papers
-
-
-def get_all_papers():
-    """获取所有会议的论文数据"""
-    all_papers = []
-    for conf_name, conf_key in CONFERENCES.items():
-        print(f"\n正在爬取 {conf_name} ...")
-        papers = fetch_dblp_api_with_pagination(conf_key, conf_name)
-        print(f"{conf_name} 总论文数：{len(papers)}")
-        all_papers.extend(papers)
+def get_all_papers(max_workers=4, max_rps=2.0, dump=None, store_path=STORE_FILE):
+    """
+    获取所有会议的论文数据
+
+    参数:
+        dump (str): 本地 dblp.xml(.gz) 路径，指定时从转储中提取，不联网；否则并发爬取 DBLP API
+        store_path (str): 论文库路径，爬取结果逐页写入并记录检查点，已完成的页面不再请求
+    """
+    start = time.perf_counter()
+    if dump:
+        print(f"正在从 {dump} 提取 {', '.join(CONFERENCES)} {START_YEAR}-{END_YEAR} 年论文 ...")
+        all_papers = load_dump(dump, CONFERENCES, range(START_YEAR, END_YEAR + 1))
+    else:
+        print(f"正在并发爬取 {', '.join(CONFERENCES)} {START_YEAR}-{END_YEAR} 年论文 ...")
+        with PaperStore(store_path) as store:
+            fetched, failures = harvest(CONFERENCES, range(START_YEAR, END_YEAR + 1), max_workers, max_rps,
+                                        store=store)
+            all_papers = store.papers(CONFERENCES, range(START_YEAR, END_YEAR + 1))
+        report_failures(failures)
+        print(f"本次新爬取 {len(fetched)} 篇，论文库 {store_path} 中共 {len(all_papers)} 篇")
+        if failures:
+            print("部分页面获取失败，重新运行将只补爬这些页面")
+    print(f"获取完成，用时 {time.perf_counter() - start:.1f} 秒")
 
     df = pd.DataFrame(all_papers)
     print(f"\n总论文数：{len(df)}")
@@ -331,10 +284,15 @@ def predict_and_visualize(df):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='学术论文发表趋势分析')
+    parser.add_argument('--dump', help='本地 dblp.xml 或 dblp.xml.gz 路径，指定时离线提取论文，不请求 DBLP API')
+    parser.add_argument('--store', default=STORE_FILE, help='论文库路径，中断后重新运行会从检查点继续')
+    args = parser.parse_args()
+
     print("=== 学术论文发表趋势分析 ===\n")
 
     # 1. 爬取数据
-    df = get_all_papers()
+    df = get_all_papers(dump=args.dump, store_path=args.store)
     if df.empty:
         print("未获取到任何论文数据，请检查网络或爬虫逻辑。")
         return
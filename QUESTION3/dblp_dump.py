@@ -0,0 +1,111 @@
+import gzip
+import html.entities
+import os
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # 未安装 lxml 时使用标准库解析
+    lxml_etree = None
+
+# 需要的记录类型：会议论文和会议论文集本身，与检索接口的 stream 结果一致
+RECORD_TAGS = ('inproceedings', 'proceedings')
+RECORD_URL = 'https://dblp.org/rec/{}'
+
+
+def record_to_paper(elem, conf_name, year):
+    """把一条 XML 记录转换为与 dblp_fetch.harvest 相同格式的论文字典"""
+    title_elem = elem.find('title')
+    # 标题中可能含 <i>、<sub> 等标记，取全部文本
+    title = ''.join(title_elem.itertext()) if title_elem is not None else ''
+    authors = [''.join(a.itertext()) for a in elem.findall('author')] or \
+              [''.join(e.itertext()) for e in elem.findall('editor')]
+    return {
+        "title": title,
+        "authors": ', '.join(authors),
+        "year": year,
+        "conference": conf_name,
+        "link": RECORD_URL.format(elem.get('key'))
+    }
+
+
+def _open(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def _iter_records_lxml(path):
+    """lxml 解析：按转储旁的 dblp.dtd 解析实体"""
+    with _open(path) as f:
+        for _, elem in lxml_etree.iterparse(f, events=('end',), tag=RECORD_TAGS, load_dtd=True, huge_tree=True):
+            yield elem
+            # 释放已处理的记录及其之前的兄弟节点，保持内存恒定
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _iter_records_stdlib(path):
+    """标准库解析：dblp.dtd 中的实体按 HTML 实体名替换"""
+    parser = ET.XMLParser()
+    parser.entity.update(html.entities.entitydefs)
+    with _open(path) as f:
+        depth = 0
+        root = None
+        for event, elem in ET.iterparse(f, events=('start', 'end'), parser=parser):
+            if event == 'start':
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
+            depth -= 1
+            if depth == 1:
+                if elem.tag in RECORD_TAGS:
+                    yield elem
+                # 记录处理完后从根节点移除，保持内存恒定
+                root.clear()
+
+
+def iter_records(path):
+    """
+    流式遍历 dblp.xml(.gz) 中的会议记录
+
+    安装了 lxml 且转储旁有 dblp.dtd 时使用 lxml，否则使用标准库
+    """
+    dtd = os.path.join(os.path.dirname(os.path.abspath(path)), 'dblp.dtd')
+    if lxml_etree is not None and os.path.exists(dtd):
+        return _iter_records_lxml(path)
+    return _iter_records_stdlib(path)
+
+
+def load_dump(path, conferences, years):
+    """
+    从本地 DBLP 转储中提取指定会议和年份的论文，不联网
+
+    按记录 key 的前缀 conf/<会议键>/ 筛选会议，结果按 会议（conferences 顺序）、年份、
+    转储中的顺序排列，字段与 dblp_fetch.harvest 相同；只有标题非空的记录保留
+
+    参数:
+        path (str): dblp.xml 或 dblp.xml.gz 路径
+        conferences (dict): 会议名 -> DBLP 会议键，例如 {"NeurIPS": "nips"}
+        years (iterable): 年份
+
+    返回:
+        list: 论文字典列表
+    """
+    prefixes = {f'conf/{key}/': name for name, key in conferences.items()}
+    years = set(years)
+    buckets = {(name, year): [] for name in conferences for year in sorted(years)}
+
+    for elem in iter_records(path):
+        key = elem.get('key', '')
+        conf_name = prefixes.get(key[:key.find('/', 5) + 1])
+        if conf_name is None:
+            continue
+        year_text = elem.findtext('year')
+        if not year_text or not year_text.isdigit() or int(year_text) not in years:
+            continue
+        paper = record_to_paper(elem, conf_name, int(year_text))
+        if paper['title']:
+            buckets[(conf_name, paper['year'])].append(paper)
+
+    return [paper for bucket in buckets.values() for paper in bucket]
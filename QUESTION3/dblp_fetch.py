@@ -0,0 +1,194 @@
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# DBLP 检索接口: 会议 stream、年份、每页条数、偏移
+API_URL = "https://dblp.org/search/publ/api?q=stream%3Aconf%2F{}%3A{}%3A&h={}&f={}&format=json"
+PAGE_SIZE = 1000
+
+# 单页结果: 会议名、年份、偏移、该会议该年的总条数、论文列表
+Page = namedtuple('Page', ['conference', 'year', 'offset', 'total', 'papers'])
+# 重试后仍失败的页面
+Failure = namedtuple('Failure', ['conference', 'year', 'offset', 'error'])
+
+
+class RateLimiter:
+    """
+    线程安全的限速器，保证相邻两次请求的发出间隔不小于 1/max_rps 秒
+
+    参数:
+        max_rps (float): 每秒最多发出的请求数，None 或 0 表示不限速
+    """
+
+    def __init__(self, max_rps):
+        self.interval = 1.0 / max_rps if max_rps else 0.0
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """阻塞直到允许发出下一个请求"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def backoff_delay(retry, base=1.0, cap=60.0):
+    """指数退避 + 全抖动：在 [0, min(cap, base * 2^retry)] 内随机取值"""
+    return random.uniform(0, min(cap, base * 2 ** retry))
+
+
+def make_session(pool_size):
+    """创建带连接池的会话，所有请求复用同一组连接"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def parse_authors(authors):
+    """解析作者信息，处理不同格式"""
+    if isinstance(authors, dict):
+        author = authors.get('author', [])
+        if isinstance(author, list):
+            names = []
+            for a in author:
+                if isinstance(a, dict):
+                    names.append(a.get('text', ''))
+                else:
+                    names.append(str(a))
+            return ', '.join(names)
+        elif isinstance(author, dict):
+            return author.get('text', '')
+        else:
+            return str(author)
+    elif isinstance(authors, list):
+        return ', '.join([a.get('text', '') if isinstance(a, dict) else str(a) for a in authors])
+    else:
+        return str(authors)
+
+
+def fetch_json(session, limiter, url, retries=4, timeout=15):
+    """
+    带限速和指数退避重试的 GET 请求，返回解码后的 JSON
+
+    服务器返回 429/503 且带 Retry-After 时按其要求等待
+    """
+    for retry in range(retries):
+        limiter.acquire()
+        try:
+            resp = session.get(url, timeout=timeout)
+            if resp.status_code in (429, 503) and resp.headers.get('Retry-After', '').isdigit():
+                if retry == retries - 1:
+                    resp.raise_for_status()
+                time.sleep(int(resp.headers['Retry-After']))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+        except (requests.RequestException, ValueError):
+            if retry == retries - 1:
+                raise
+            time.sleep(backoff_delay(retry))
+
+
+def fetch_page(session, limiter, conf_key, conf_name, year, offset, page_size=PAGE_SIZE):
+    """
+    爬取某会议某年的一页论文
+
+    返回:
+        Page: 该页论文（只保留有标题的）及该会议该年的总条数
+    """
+    data = fetch_json(session, limiter, API_URL.format(conf_key, year, page_size, offset))
+    hits = data.get('result', {}).get('hits', {})
+    papers = []
+    for hit in hits.get('hit', []):
+        info = hit.get('info', {})
+        title = info.get('title', '')
+        if title:  # 只保存有标题的论文
+            papers.append({
+                "title": title,
+                "authors": parse_authors(info.get('authors', {})),
+                "year": year,
+                "conference": conf_name,
+                "link": info.get('url', '')
+            })
+    return Page(conf_name, year, offset, int(hits.get('@total', 0)), papers)
+
+
+def harvest(conferences, years, max_workers=4, max_rps=2.0, page_size=PAGE_SIZE, store=None):
+    """
+    并发爬取 会议x年份x偏移 的全部页面
+
+    先并发请求每个 会议x年份 的第一页得到总条数，再把其余偏移加入同一个线程池；
+    所有请求共享一个连接池会话和一个限速器。结果按 会议（conferences 顺序）、年份、偏移
+    排序拼接，与串行爬取的顺序一致
+
+    指定 store 时每页成功后立即写入 store 并记录检查点；已有检查点的页面不再请求，
+    全部页面都已完成的 会议x年份 整体跳过；第一页总条数为 0 的不算完成，每次都重新请求第一页
+
+    参数:
+        conferences (dict): 会议名 -> DBLP 会议键，例如 {"NeurIPS": "nips"}
+        years (iterable): 年份
+        max_workers (int): 同时在途的最大请求数
+        max_rps (float): 每秒最多发出的请求数
+        store (dblp_store.PaperStore): 论文库，None 表示不持久化
+
+    返回:
+        tuple: (本次爬取到的论文字典列表, Failure 列表)
+    """
+    conf_order = {name: i for i, name in enumerate(conferences)}
+    years = list(years)
+    pages = []
+    failures = []
+
+    with make_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit(conf_name, year, offset):
+            future = pool.submit(fetch_page, session, limiter, conferences[conf_name], conf_name, year, offset,
+                                 page_size)
+            pending[future] = (conf_name, year, offset)
+
+        limiter = RateLimiter(max_rps)
+        pending = {}
+        done_offsets = {}
+        for conf_name in conferences:
+            for year in years:
+                total, done = store.progress(conf_name, year) if store else (None, set())
+                done_offsets[(conf_name, year)] = done
+                if total is None:
+                    submit(conf_name, year, 0)
+                    continue
+                for offset in range(page_size, total, page_size):
+                    if offset not in done:
+                        submit(conf_name, year, offset)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                conf_name, year, offset = pending.pop(future)
+                try:
+                    page = future.result()
+                except Exception as e:
+                    # 网络错误之外，响应结构异常（如 hits 不是字典）也只记为该页失败，不中断其余页面
+                    failures.append(Failure(conf_name, year, offset, f'{type(e).__name__}: {e}'))
+                    continue
+                pages.append(page)
+                if store is not None:
+                    store.save_page(page)
+                if offset == 0:
+                    for next_offset in range(page_size, page.total, page_size):
+                        if next_offset not in done_offsets[(conf_name, year)]:
+                            submit(conf_name, year, next_offset)
+
+    pages.sort(key=lambda p: (conf_order[p.conference], p.year, p.offset))
+    failures.sort(key=lambda f: (conf_order[f.conference], f.year, f.offset))
+    return [paper for page in pages for paper in page.papers], failures
@@ -0,0 +1,104 @@
+import sqlite3
+import time
+
+STORE_FILE = 'papers.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    key TEXT PRIMARY KEY,
+    link TEXT,
+    title TEXT NOT NULL,
+    authors TEXT,
+    year INTEGER NOT NULL,
+    conference TEXT NOT NULL,
+    page_offset INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    conference TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    page_offset INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    papers INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (conference, year, page_offset)
+);
+"""
+
+
+class PaperStore:
+    """
+    基于 sqlite3 的论文库和爬取检查点
+
+    papers 表以 DBLP 记录链接（https://dblp.org/rec/<key>）为键，重复爬取同一论文只保留一条；
+    checkpoints 表记录每个已成功写入的 (会议, 年份, 偏移) 页面。一页的论文和它的检查点在
+    同一个事务中写入，中断后重新运行只会补爬缺失的页面
+
+    参数:
+        path (str): 数据库文件路径
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save_page(self, page):
+        """
+        写入一页论文并记录检查点
+
+        参数:
+            page (dblp_fetch.Page): 爬取到的页面
+        """
+        rows = []
+        for position, paper in enumerate(page.papers):
+            # 没有链接的记录用 会议/年份/偏移/序号 作为键
+            key = paper['link'] or f"{page.conference}/{page.year}/{page.offset}/{position}"
+            rows.append((key, paper['link'], paper['title'], paper['authors'], paper['year'], paper['conference'],
+                         page.offset, position))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                              (page.conference, page.year, page.offset, page.total, len(page.papers), time.time()))
+
+    def progress(self, conference, year):
+        """
+        某会议某年的爬取进度
+
+        第一页返回的总条数为 0 时（论文集尚未收录或接口临时返回空结果）不算完成，总条数记为 None，
+        下次运行会重新请求第一页
+
+        返回:
+            tuple: (总条数，未爬过第一页或总条数为 0 时为 None, 已完成的偏移集合)
+        """
+        rows = self.conn.execute("SELECT page_offset, total FROM checkpoints WHERE conference = ? AND year = ?",
+                                 (conference, year)).fetchall()
+        offsets = {offset for offset, _ in rows}
+        total = next((t for offset, t in rows if offset == 0), None) or None
+        return total, offsets
+
+    def papers(self, conferences, years):
+        """
+        读取指定会议和年份的论文，按 会议（conferences 顺序）、年份、偏移、页内顺序排列
+
+        返回:
+            list: 与 dblp_fetch.harvest 格式相同的论文字典列表
+        """
+        conf_order = {name: i for i, name in enumerate(conferences)}
+        years = list(years)
+        rows = self.conn.execute(
+            "SELECT title, authors, year, conference, link, page_offset, position FROM papers "
+            f"WHERE conference IN ({','.join('?' * len(conf_order))}) AND year IN ({','.join('?' * len(years))})",
+            list(conf_order) + years).fetchall()
+        rows.sort(key=lambda r: (conf_order[r[3]], r[2], r[5], r[6]))
+        return [{"title": title, "authors": authors, "year": year, "conference": conference, "link": link}
+                for title, authors, year, conference, link, _, _ in rows]